@@ -13,6 +13,7 @@ import threading
 import tkinter as tk
 from google.cloud import vision
 import pigpio
+import sound_bank
 
 # ==================================================
 # BASIC SETUP
@@ -109,11 +110,11 @@ AUDIO_FILES = {
 
 def play_audio(path):
     try:
-        if os.path.exists(path):
-            pygame.mixer.music.load(path)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
+        sound = sound_bank.get_sound(path)
+        if sound is not None:
+            channel = sound.play()
+            while channel is not None and channel.get_busy():
+                pygame.time.wait(10)
         else:
             logger.warning(f"Missing audio: {path}")
     except Exception as e:
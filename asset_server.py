@@ -0,0 +1,205 @@
+import os
+import sys
+import gzip
+import logging
+import threading
+import mimetypes
+import urllib.parse
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+# Only reachable from this machine
+HOST = "127.0.0.1"
+PORT = 8765
+ROOT = os.path.dirname(os.path.realpath(__file__))
+
+# Only web assets are served; everything else in the directory (scripts,
+# credentials, caches) answers 404
+ASSET_TYPES = {".html", ".htm", ".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".svg",
+               ".webp", ".ico", ".wav", ".mp3", ".ogg", ".woff", ".woff2"}
+
+# Text types worth compressing; images and audio are already compressed
+COMPRESSIBLE_TYPES = {".html", ".htm", ".js", ".css", ".svg"}
+COMPRESS_LEVEL = 9
+
+# Browsers reuse a response this long without asking; after that they
+# revalidate with the ETag and get a 304 if the file is unchanged
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+_server = None
+# (path, mtime_ns, size) -> gzip bytes, so each file is compressed once
+_gzip_cache = {}
+_gzip_lock = threading.Lock()
+
+
+def _etag(stat, encoding=""):
+    tag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def _resolve(url_path):
+    """Absolute path of a servable asset for a request path, or None."""
+    relative = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path).lstrip("/")
+    path = os.path.realpath(os.path.join(ROOT, relative))
+    if os.path.commonpath([path, ROOT]) != ROOT:
+        return None
+    if os.path.splitext(path)[1].lower() not in ASSET_TYPES or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _gzipped(path, stat):
+    """Gzip body for path: a fresh .gz next to it if there is one, else compressed once in memory."""
+    precompressed = path + ".gz"
+    try:
+        if os.stat(precompressed).st_mtime_ns >= stat.st_mtime_ns:
+            with open(precompressed, "rb") as f:
+                return f.read()
+    except OSError:
+        pass
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _gzip_lock:
+        body = _gzip_cache.get(key)
+    if body is None:
+        with open(path, "rb") as f:
+            body = gzip.compress(f.read(), COMPRESS_LEVEL, mtime=0)
+        with _gzip_lock:
+            # Drop variants of older versions of the file
+            for old in [k for k in _gzip_cache if k[0] == path]:
+                del _gzip_cache[old]
+            _gzip_cache[key] = body
+    return body
+
+
+class AssetHandler(SimpleHTTPRequestHandler):
+    """Serves the game assets with ETags, gzip and long cache lifetimes."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive between the page and its assets
+
+    def do_GET(self):
+        self._send(head_only=False)
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def _send(self, head_only):
+        path = _resolve(self.path)
+        if path is None:
+            self.send_error(404)
+            return
+        stat = os.stat(path)
+        extension = os.path.splitext(path)[1].lower()
+        use_gzip = (extension in COMPRESSIBLE_TYPES
+                    and "gzip" in self.headers.get("Accept-Encoding", ""))
+        etag = _etag(stat, "gzip" if use_gzip else "")
+
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self._cache_headers(etag, stat, extension)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if use_gzip:
+            body = _gzipped(path, stat)
+        else:
+            with open(path, "rb") as f:
+                body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self._cache_headers(etag, stat, extension)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def _cache_headers(self, etag, stat, extension):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(stat.st_mtime, usegmt=True))
+        self.send_header("Cache-Control", f"public, max-age={CACHE_MAX_AGE}")
+        if extension in COMPRESSIBLE_TYPES:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def precompress(root=ROOT):
+    """Compress every text asset under root into the in-memory cache."""
+    count = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_TYPES:
+                try:
+                    _gzipped(path, os.stat(path))
+                    count += 1
+                except OSError as e:
+                    logger.warning(f"Could not compress {path}: {e}")
+    return count
+
+
+def write_gz_files(root=ROOT):
+    """Write a .gz next to every text asset, for serving without compressing."""
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_TYPES:
+                with open(path, "rb") as f, open(path + ".gz", "wb") as out:
+                    out.write(gzip.compress(f.read(), COMPRESS_LEVEL, mtime=0))
+                print(f"Wrote {path}.gz")
+
+
+def is_running():
+    return _server is not None
+
+
+def start(host=HOST, port=PORT):
+    """Serve the assets from a background thread. Returns False if the port is taken."""
+    global _server
+    if _server is not None:
+        return True
+    try:
+        _server = ThreadingHTTPServer((host, port), AssetHandler)
+    except OSError as e:
+        logger.error(f"Asset server could not listen on {host}:{port}: {e}")
+        return False
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="asset-server", daemon=True).start()
+    # Compress the games up front so the first launch is not slower
+    threading.Thread(target=precompress, name="asset-precompress", daemon=True).start()
+    logger.info(f"Serving game assets on http://{host}:{port}/")
+    return True
+
+
+def url(filename, query=None):
+    """http:// URL of an asset under ROOT, or None if the server is not running."""
+    if _server is None:
+        return None
+    host, port = _server.server_address[:2]
+    relative = os.path.relpath(os.path.abspath(filename), ROOT).replace(os.sep, "/")
+    result = f"http://{host}:{port}/{urllib.parse.quote(relative)}"
+    if query:
+        result += "?" + urllib.parse.urlencode(query)
+    return result
+
+
+def stop():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) >= 2 and sys.argv[1] == "--write-gz":
+        write_gz_files(sys.argv[2] if len(sys.argv) > 2 else ROOT)
+    else:
+        if start(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT):
+            threading.Event().wait()
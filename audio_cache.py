@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Every prompt is decoded to this mixer format, whatever its source codec
+SAMPLE_RATE = 44100
+SAMPLE_SIZE = -16
+CHANNELS = 2
+
+CACHE_DIR = ".audio_cache"
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+_index = None
+_lock = threading.Lock()
+
+
+def init_mixer():
+    """Initialise pygame.mixer with the format the cache is stored in."""
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=SAMPLE_SIZE, channels=CHANNELS)
+
+
+def _mixer_format():
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        raise RuntimeError("pygame.mixer is not initialised")
+    return "{}-{}-{}".format(*mixer_format)
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_FILE) as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(_index, f, indent=1)
+    os.replace(tmp_path, INDEX_FILE)
+
+
+def _file_digest(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_path(file_path):
+    """Return the PCM cache file for file_path, transcoding it if stale.
+
+    Caller must hold the lock.
+    """
+    index = _load_index()
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    mixer_format = _mixer_format()
+    entry = index.get(key)
+
+    if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size \
+            and entry["format"] == mixer_format:
+        digest = entry["digest"]
+    else:
+        digest = _file_digest(file_path)
+
+    pcm_path = os.path.join(CACHE_DIR, f"{digest}-{mixer_format}.pcm")
+    if not os.path.exists(pcm_path):
+        # pygame decodes straight into the mixer format, which is our
+        # normalised sample rate, size and channel count
+        raw = pygame.mixer.Sound(file_path).get_raw()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = pcm_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, pcm_path)
+        logger.info(f"Transcoded {file_path} to PCM cache ({len(raw) // 1024} KB)")
+
+    new_entry = {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "digest": digest,
+        "format": mixer_format,
+    }
+    if entry != new_entry:
+        index[key] = new_entry
+        _save_index()
+    return pcm_path
+
+
+def load(file_path):
+    """Return a pygame Sound for file_path, read from the PCM cache.
+
+    The cached PCM is handed to the mixer as-is rather than decoded, so
+    loading costs the same for WAV and MP3 sources. pygame copies the
+    buffer into the Sound, so the file is simply read in one go.
+    """
+    with _lock:
+        pcm_path = _cache_path(file_path)
+    with open(pcm_path, "rb") as f:
+        return pygame.mixer.Sound(buffer=f.read())
+
+
+def compile_assets(file_paths):
+    """Transcode every existing file in file_paths into the PCM cache."""
+    compiled = 0
+    for file_path in dict.fromkeys(file_paths):
+        if not file_path or not os.path.exists(file_path):
+            continue
+        try:
+            with _lock:
+                _cache_path(file_path)
+            compiled += 1
+        except Exception as e:
+            logger.error(f"Error transcoding {file_path}: {e}")
+    logger.info(f"Audio cache ready: {compiled} files")
+    return compiled
+
+
+if __name__ == "__main__":
+    # One-off build: python audio_cache.py [audio_dir]
+    logging.basicConfig(level=logging.INFO)
+    audio_dir = sys.argv[1] if len(sys.argv) > 1 else "audio_files"
+    init_mixer()
+    compile_assets(os.path.join(audio_dir, name) for name in sorted(os.listdir(audio_dir))
+                   if name.lower().endswith((".wav", ".mp3", ".ogg")))
@@ -0,0 +1,128 @@
+import logging
+import threading
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Two reserved channels for spoken prompts so a preempting prompt can fade in
+# while the one it replaces fades out; the rest are shared by short effects
+VOICE_CHANNELS = 2
+TOTAL_CHANNELS = 8
+
+# Default fade used when a prompt is cut off
+FADE_MS = 150
+
+# Voice volume while an effect is ducking it
+DUCK_VOLUME = 0.35
+
+_voice_channels = []
+_next_voice = 0
+_voice_priority = None
+_duck_count = 0
+_lock = threading.RLock()
+
+
+def init():
+    """Reserve the voice channels. Safe to call more than once."""
+    global _voice_channels
+    with _lock:
+        if _voice_channels:
+            return
+        pygame.mixer.set_num_channels(TOTAL_CHANNELS)
+        pygame.mixer.set_reserved(VOICE_CHANNELS)
+        _voice_channels = [pygame.mixer.Channel(i) for i in range(VOICE_CHANNELS)]
+        logger.info(f"Audio channels ready: {VOICE_CHANNELS} voice, "
+                    f"{TOTAL_CHANNELS - VOICE_CHANNELS} effects")
+
+
+def _voice_volume():
+    return DUCK_VOLUME if _duck_count else 1.0
+
+
+def voice_busy():
+    """True while any voice channel is still playing."""
+    return any(channel.get_busy() for channel in _voice_channels)
+
+
+def current_priority():
+    """Priority of the prompt on the voice channels, or None when idle."""
+    with _lock:
+        return _voice_priority if voice_busy() else None
+
+
+def play_voice(sound, priority, fade_ms=FADE_MS):
+    """Play sound as the current spoken prompt and return its channel.
+
+    Whatever prompt is still on the voice channels is faded out, so callers
+    should only get here once they have decided to preempt it.
+    """
+    global _next_voice, _voice_priority
+    init()
+    with _lock:
+        for channel in _voice_channels:
+            if channel.get_busy():
+                channel.fadeout(fade_ms)
+        channel = _voice_channels[_next_voice]
+        _next_voice = (_next_voice + 1) % VOICE_CHANNELS
+        channel.set_volume(_voice_volume())
+        channel.play(sound)
+        _voice_priority = priority
+        return channel
+
+
+def stop_voice(below_priority=None, fade_ms=FADE_MS):
+    """Fade out the current prompt.
+
+    With below_priority set, only a prompt less important than that
+    priority (a higher number) is stopped. Returns True if something
+    was stopped.
+    """
+    with _lock:
+        if not voice_busy():
+            return False
+        if below_priority is not None and (_voice_priority is None or _voice_priority <= below_priority):
+            return False
+        for channel in _voice_channels:
+            channel.fadeout(fade_ms)
+        logger.info(f"Interrupted prompt with priority {_voice_priority}")
+        return True
+
+
+def duck():
+    """Lower the voice channels until a matching unduck()."""
+    global _duck_count
+    with _lock:
+        _duck_count += 1
+        for channel in _voice_channels:
+            channel.set_volume(_voice_volume())
+
+
+def unduck():
+    """Undo one duck(); voice returns to full volume when none remain."""
+    global _duck_count
+    with _lock:
+        _duck_count = max(0, _duck_count - 1)
+        for channel in _voice_channels:
+            channel.set_volume(_voice_volume())
+
+
+def play_effect(sound, duck_voice=True):
+    """Play a short effect alongside any prompt and return its channel.
+
+    Returns None when every effect channel is busy. With duck_voice the
+    prompt is lowered for the length of the effect.
+    """
+    init()
+    channel = pygame.mixer.find_channel()
+    if channel is None:
+        logger.warning("No free channel for effect")
+        return None
+    channel.set_volume(1.0)
+    channel.play(sound)
+    if duck_voice:
+        duck()
+        timer = threading.Timer(sound.get_length(), unduck)
+        timer.daemon = True
+        timer.start()
+    return channel
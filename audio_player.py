@@ -0,0 +1,148 @@
+import os
+import logging
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import sound_bank
+import audio_channels
+
+logger = logging.getLogger(__name__)
+
+# Lower numbers play first; clips with equal priority play in request order
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BACKGROUND = 9
+
+# How often the worker checks whether the current clip is still playing
+POLL_INTERVAL = 0.01
+
+_queue = queue.PriorityQueue()
+_sequence = itertools.count()
+_worker = None
+_worker_lock = threading.Lock()
+_stopping = threading.Event()
+_interrupted = threading.Event()
+
+
+def _wait_for_channel(channel):
+    """Block the worker until channel has finished playing."""
+    while channel is not None and channel.get_busy() and not _stopping.is_set():
+        time.sleep(POLL_INTERVAL)
+
+
+def _play_now(file_path, priority):
+    """Play one clip on the worker thread.
+
+    Returns True if it played to the end, False if it was missing or was
+    interrupted by a more important clip.
+    """
+    sound = sound_bank.get_sound(file_path)
+    if sound is None:
+        logger.warning(f"Audio file not found: {file_path}")
+        print(f"Missing audio: {os.path.basename(file_path)}")
+        return False
+    _interrupted.clear()
+    _wait_for_channel(audio_channels.play_voice(sound, priority))
+    if _interrupted.is_set():
+        logger.info(f"Interrupted audio: {file_path}")
+        return False
+    logger.info(f"Played audio: {file_path}")
+    return True
+
+
+def _run():
+    """Worker loop: play queued clips one at a time in priority order."""
+    while not _stopping.is_set():
+        priority, _, file_path, future = _queue.get()
+        if future is None:
+            break
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(_play_now(file_path, priority))
+        except Exception as e:
+            logger.error(f"Error playing audio {file_path}: {e}")
+            print(f"Audio error: {os.path.basename(file_path)}")
+            future.set_result(False)
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _stopping.clear()
+            _worker = threading.Thread(target=_run, name="audio-player", daemon=True)
+            _worker.start()
+
+
+def play(file_path, priority=PRIORITY_NORMAL, interrupt=False):
+    """Queue file_path for playback and return a Future for its completion.
+
+    The future resolves to True once the clip has finished playing, or to
+    False if the file is missing, could not be played or was interrupted.
+    Cancelling the future before the clip starts drops it from the queue.
+
+    With interrupt, any less important clip that is playing is faded out
+    and less important clips still waiting in the queue are cancelled, so
+    this one starts right away.
+    """
+    _ensure_worker()
+    future = Future()
+    if interrupt:
+        cancel_pending(below_priority=priority)
+        if audio_channels.stop_voice(below_priority=priority):
+            _interrupted.set()
+    _queue.put((priority, next(_sequence), file_path, future))
+    return future
+
+
+def play_effect(file_path, duck_voice=True):
+    """Play a short clip right away on top of any prompt.
+
+    Effects bypass the queue; with duck_voice the current prompt is
+    lowered while the effect plays. Returns True if it started.
+    """
+    try:
+        sound = sound_bank.get_sound(file_path)
+        if sound is None:
+            logger.warning(f"Audio file not found: {file_path}")
+            return False
+        return audio_channels.play_effect(sound, duck_voice) is not None
+    except Exception as e:
+        logger.error(f"Error playing effect {file_path}: {e}")
+        return False
+
+
+def cancel_pending(below_priority=None):
+    """Cancel queued clips that have not started playing yet.
+
+    With below_priority set, only clips less important than that priority
+    are cancelled; the rest stay queued in their original order.
+    """
+    cancelled = 0
+    keep = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        future = item[3]
+        if future is None or (below_priority is not None and item[0] <= below_priority):
+            keep.append(item)
+        elif future.cancel():
+            cancelled += 1
+    for item in keep:
+        _queue.put(item)
+    return cancelled
+
+
+def stop():
+    """Stop the worker thread, dropping anything still queued."""
+    _stopping.set()
+    cancel_pending()
+    _queue.put((PRIORITY_URGENT, next(_sequence), None, None))
+    if _worker is not None:
+        _worker.join(timeout=2)
@@ -15,6 +15,7 @@ import threading
 import signal
 from google.cloud import vision
 import RPi.GPIO as GPIO
+import sound_bank
 import serial
 
 
@@ -259,13 +260,13 @@ def show_fullscreen_image(image_path="test_image.png"):
 def play_audio(file_path):
     """Play an audio file using pygame."""
     try:
-        if os.path.exists(file_path):
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.play()
+        sound = sound_bank.get_sound(file_path)
+        if sound is not None:
+            channel = sound.play()
             
             # Wait for the audio to finish playing
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
+            while channel is not None and channel.get_busy():
+                pygame.time.wait(10)
             
             logger.info(f"Played audio: {file_path}")
         else:
@@ -607,6 +608,10 @@ def main():
         print("Please ensure keytoken.json is in the same directory as this script.")
         return
     
+    # Decode all prompts up front so replies start immediately
+    sound_bank.preload(list(GREETING_AUDIO) + list(HELP_AUDIO) + list(AUDIO_FILES.values()) +
+                       [config["audio"] for config in TOPIC_CONFIG.values()])
+    
     # Test Google Vision API connectivity
     try:
         client = vision.ImageAnnotatorClient()
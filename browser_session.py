@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import base64
+import socket
+import struct
+import itertools
+import logging
+import threading
+import subprocess
+import urllib.parse
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+# Chromium's DevTools endpoint, only reachable from this machine
+DEBUG_HOST = "127.0.0.1"
+DEBUG_PORT = 9222
+# A persistent profile keeps the HTTP cache of the games between boots;
+# with INCOGNITO nothing is kept, not even between two launches
+PROFILE_DIR = os.path.expanduser("~/.cache/homi_chromium")
+# Browsers launched cold use their own profile: with the warm one's,
+# Chromium would hand the page to the warm instance and exit at once
+COLD_PROFILE_DIR = os.path.expanduser("~/.cache/homi_chromium_cold")
+INCOGNITO = False
+START_TIMEOUT = 20
+REQUEST_TIMEOUT = 3
+
+# Shown while no game is open; the window is also minimised
+IDLE_URL = "data:text/html,<body style='background:%23000'></body>"
+
+BROWSER_CMD = [
+    "chromium-browser",
+    "--kiosk",                    # fullscreen kiosk mode
+    "--noerrdialogs",             # no error dialogs
+    "--disable-infobars",         # hide info bars
+    "--start-fullscreen",         # ensure fullscreen on startup
+    "--no-first-run",
+    "--disable-session-crashed-bubble",
+]
+
+_process = None
+_lock = threading.Lock()
+_showing = False  # a game page is on screen
+_prepared_url = None  # page loaded behind the minimised window
+_message_ids = itertools.count(1)
+
+
+def _http(path, method="GET"):
+    request = urllib.request.Request(f"http://{DEBUG_HOST}:{DEBUG_PORT}{path}", method=method)
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        return response.read().decode()
+
+
+def _http_json(path, method="GET"):
+    return json.loads(_http(path, method))
+
+
+def _recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("DevTools connection closed")
+        data += chunk
+    return data
+
+
+def _send_frame(sock, text):
+    payload = text.encode()
+    header = bytearray([0x81])  # final text frame
+    if len(payload) < 126:
+        header.append(0x80 | len(payload))
+    elif len(payload) < 65536:
+        header.append(0x80 | 126)
+        header += struct.pack(">H", len(payload))
+    else:
+        header.append(0x80 | 127)
+        header += struct.pack(">Q", len(payload))
+    # Client frames must be masked
+    mask = os.urandom(4)
+    sock.sendall(bytes(header) + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+
+
+def _recv_frame(sock):
+    first, second = _recv_exact(sock, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", _recv_exact(sock, 8))[0]
+    return first & 0x0F, _recv_exact(sock, length)
+
+
+def _cdp(ws_url, method, params=None):
+    """Send one DevTools Protocol command and return its result.
+
+    A minimal WebSocket client: connect, send the command as one frame and
+    read frames until the matching reply arrives.
+    """
+    message_id = next(_message_ids)
+    parsed = urllib.parse.urlparse(ws_url)
+    with socket.create_connection((parsed.hostname, parsed.port), timeout=REQUEST_TIMEOUT) as sock:
+        key = base64.b64encode(os.urandom(16)).decode()
+        sock.sendall((f"GET {parsed.path} HTTP/1.1\r\n"
+                      f"Host: {parsed.hostname}:{parsed.port}\r\n"
+                      "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += _recv_exact(sock, 1)
+        if b" 101 " not in response.split(b"\r\n", 1)[0]:
+            raise ConnectionError(f"DevTools refused the connection: {response.splitlines()[0]!r}")
+        _send_frame(sock, json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        while True:
+            opcode, payload = _recv_frame(sock)
+            if opcode == 0x8:
+                raise ConnectionError("DevTools connection closed")
+            if opcode != 0x1:
+                continue
+            reply = json.loads(payload.decode())
+            if reply.get("id") == message_id:
+                if "error" in reply:
+                    raise RuntimeError(f"{method} failed: {reply['error'].get('message')}")
+                return reply.get("result", {})
+
+
+def profile_args(profile_dir=PROFILE_DIR):
+    """Chromium flags selecting the profile; cold launches pass COLD_PROFILE_DIR."""
+    args = [f"--user-data-dir={profile_dir}"]
+    if INCOGNITO:
+        args.append("--incognito")
+    return args
+
+
+def is_running():
+    """True if the warm browser is up and answering on the DevTools port."""
+    if _process is None or _process.poll() is not None:
+        return False
+    try:
+        _http_json("/json/version")
+        return True
+    except OSError:
+        return False
+
+
+def start(wait=True):
+    """Start the kiosk browser on the idle page. Returns True once it answers."""
+    global _process
+    with _lock:
+        if not is_running():
+            command = BROWSER_CMD + [f"--remote-debugging-port={DEBUG_PORT}",
+                                     *profile_args(), IDLE_URL]
+            try:
+                _process = subprocess.Popen(command)
+            except FileNotFoundError:
+                logger.error("chromium-browser not found - warm browser disabled")
+                return False
+            logger.info(f"Started warm browser with PID {_process.pid}")
+        if not wait:
+            return True
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline and _process.poll() is None:
+            if is_running():
+                try:
+                    _set_window_state("minimized")
+                except (OSError, ValueError, KeyError, RuntimeError) as e:
+                    logger.warning(f"Could not minimise the warm browser: {e}")
+                return True
+            time.sleep(0.2)
+    logger.error("Warm browser did not come up")
+    return False
+
+
+def _page_target():
+    for target in _http_json("/json/list"):
+        if target.get("type") == "page":
+            return target
+    return None
+
+
+def _set_window_state(state):
+    """Minimise the kiosk window or bring it back fullscreen."""
+    target = _page_target()
+    if target is None:
+        return
+    browser_ws = _http_json("/json/version")["webSocketDebuggerUrl"]
+    window = _cdp(browser_ws, "Browser.getWindowForTarget", {"targetId": target["id"]})
+    if state != "minimized":
+        # A minimised window has to be restored before it can go fullscreen
+        _cdp(browser_ws, "Browser.setWindowBounds",
+             {"windowId": window["windowId"], "bounds": {"windowState": "normal"}})
+    _cdp(browser_ws, "Browser.setWindowBounds",
+         {"windowId": window["windowId"], "bounds": {"windowState": state}})
+
+
+def prepare_page(url):
+    """Load url behind the minimised window, so open_page(url) only has to show it.
+
+    Does nothing while a game page is on screen. Returns True if loading started.
+    """
+    global _prepared_url
+    if _showing or not is_running():
+        return False
+    try:
+        target = _page_target()
+        if target is None:
+            return False
+        _cdp(target["webSocketDebuggerUrl"], "Page.navigate", {"url": url})
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        logger.error(f"Could not prepare {url} in the warm browser: {e}")
+        return False
+    _prepared_url = url
+    return True
+
+
+def discard_page():
+    """Drop a page loaded by prepare_page() that was not shown."""
+    global _prepared_url
+    if _prepared_url is None or _showing:
+        return
+    _prepared_url = None
+    try:
+        target = _page_target()
+        if target is not None:
+            _cdp(target["webSocketDebuggerUrl"], "Page.navigate", {"url": IDLE_URL})
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        logger.error(f"Could not discard the prepared page: {e}")
+
+
+def open_page(url):
+    """Show url in the warm browser, starting it if needed. Returns True on success."""
+    global _showing, _prepared_url
+    if not is_running() and not start():
+        return False
+    start_time = time.monotonic()
+    prepared, _prepared_url = _prepared_url == url, None
+    try:
+        target = _page_target()
+        if target is None:
+            target = _http_json(f"/json/new?{urllib.parse.quote(url, safe='')}", method="PUT")
+        elif not prepared:
+            _cdp(target["webSocketDebuggerUrl"], "Page.navigate", {"url": url})
+        _http(f"/json/activate/{target['id']}")
+        _set_window_state("fullscreen")
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        logger.error(f"Could not open {url} in the warm browser: {e}")
+        return False
+    _showing = True
+    logger.info(f"Warm browser showing {url}{' (prepared)' if prepared else ''} "
+                f"after {time.monotonic() - start_time:.3f}s")
+    return True
+
+
+def show_idle():
+    """Put the browser back on the idle page and minimise it."""
+    global _showing, _prepared_url
+    _showing = False
+    _prepared_url = None
+    if not is_running():
+        return False
+    try:
+        target = _page_target()
+        if target is not None:
+            _cdp(target["webSocketDebuggerUrl"], "Page.navigate", {"url": IDLE_URL})
+        _set_window_state("minimized")
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        logger.error(f"Could not idle the warm browser: {e}")
+        return False
+    return True
+
+
+def stop():
+    """Close the warm browser."""
+    global _process
+    with _lock:
+        if _process is not None and _process.poll() is None:
+            _process.terminate()
+            try:
+                _process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                _process.kill()
+        _process = None
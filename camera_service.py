@@ -0,0 +1,178 @@
+import io
+import logging
+import threading
+
+import cv2
+
+import frame_bus
+
+try:
+    from picamera2 import Picamera2, Preview
+except ImportError:
+    Picamera2 = None
+
+logger = logging.getLogger(__name__)
+
+# Resolution of the always-on stream; high enough for OCR. The same as the
+# frame bus, so stills do not lose detail when the games share the camera
+STILL_SIZE = frame_bus.FRAME_SIZE
+
+# Preview window (x, y, width, height) so the child can aim the worksheet
+PREVIEW_WINDOW = (0, 0, 640, 480)
+PREVIEW_TITLE = "Homework"
+
+_picam2 = None
+_reader = None
+_lock = threading.Lock()
+_preview_thread = None
+_preview_stop = threading.Event()
+
+
+def start(show_preview=False):
+    """Open the camera and keep it streaming. Returns True on success.
+
+    When the frame bus producer is running the service reads from it
+    instead of opening the sensor, so games can share the camera.
+    """
+    global _picam2, _reader
+    with _lock:
+        if _picam2 is not None or _reader is not None:
+            return True
+        _reader = frame_bus.open_reader()
+        if _reader is not None:
+            logger.info("Camera service reading from frame bus")
+            return True
+        if Picamera2 is None:
+            logger.warning("picamera2 not available - camera service disabled")
+            return False
+        picam2 = None
+        try:
+            picam2 = Picamera2()
+            config = picam2.create_video_configuration(main={"size": STILL_SIZE, "format": "RGB888"})
+            picam2.configure(config)
+            if show_preview:
+                try:
+                    x, y, width, height = PREVIEW_WINDOW
+                    picam2.start_preview(Preview.QTGL, x=x, y=y, width=width, height=height)
+                except Exception as e:
+                    logger.warning(f"Camera preview unavailable: {e}")
+            picam2.start()
+            _picam2 = picam2
+            logger.info(f"Camera service streaming at {STILL_SIZE[0]}x{STILL_SIZE[1]}")
+            return True
+        except Exception as e:
+            logger.error(f"Camera service failed to start: {e}")
+            if picam2 is not None:
+                try:
+                    picam2.close()
+                except Exception:
+                    pass
+            return False
+
+
+def is_running():
+    return _picam2 is not None or _reader is not None
+
+
+def uses_frame_bus():
+    return _reader is not None
+
+
+def _encode_bus_frame(image_format):
+    """Encode the newest frame bus frame. Caller must hold the lock."""
+    # A private copy: the producer may reuse a slot while the JPEG is encoded
+    _, frame = _reader.latest_copy()
+    if frame is None:
+        logger.error("No frame available on frame bus")
+        return None
+    extension = ".jpg" if image_format == "jpeg" else f".{image_format}"
+    ok, encoded = cv2.imencode(extension, frame)
+    if not ok:
+        logger.error("Error encoding frame bus frame")
+        return None
+    logger.info(f"Still captured from frame bus: {len(encoded) // 1024} KB")
+    return encoded.tobytes()
+
+
+def grab_still(image_format="jpeg"):
+    """Encode the next frame from the running stream and return its bytes.
+
+    Returns None if the service is not running or the capture fails.
+    """
+    with _lock:
+        if _reader is not None:
+            return _encode_bus_frame(image_format)
+        if _picam2 is None:
+            return None
+        try:
+            buffer = io.BytesIO()
+            _picam2.capture_file(buffer, format=image_format)
+            logger.info(f"Still captured: {buffer.tell() // 1024} KB")
+            return buffer.getvalue()
+        except Exception as e:
+            logger.error(f"Error grabbing still: {e}")
+            return None
+
+
+def _show_bus_frames(reader):
+    """Show frame bus frames in the preview window until _preview_stop is set."""
+    x, y, width, height = PREVIEW_WINDOW
+    cv2.namedWindow(PREVIEW_TITLE, cv2.WINDOW_NORMAL)
+    cv2.resizeWindow(PREVIEW_TITLE, width, height)
+    cv2.moveWindow(PREVIEW_TITLE, x, y)
+    while not _preview_stop.is_set():
+        _, frame = reader.latest_copy()
+        if frame is not None:
+            cv2.imshow(PREVIEW_TITLE, cv2.resize(frame, (width, height)))
+        cv2.waitKey(30)
+    cv2.destroyWindow(PREVIEW_TITLE)
+    cv2.waitKey(1)
+
+
+def start_preview():
+    """Show what the camera sees, so the child can aim the worksheet."""
+    global _preview_thread
+    with _lock:
+        if _picam2 is not None:
+            try:
+                x, y, width, height = PREVIEW_WINDOW
+                _picam2.start_preview(Preview.QTGL, x=x, y=y, width=width, height=height)
+            except Exception as e:
+                logger.warning(f"Camera preview unavailable: {e}")
+        elif _reader is not None and _preview_thread is None:
+            _preview_stop.clear()
+            _preview_thread = threading.Thread(target=_show_bus_frames, args=(_reader,),
+                                               name="camera-preview", daemon=True)
+            _preview_thread.start()
+
+
+def stop_preview():
+    global _preview_thread
+    if _preview_thread is not None:
+        _preview_stop.set()
+        _preview_thread.join()
+        _preview_thread = None
+    with _lock:
+        if _picam2 is not None:
+            try:
+                _picam2.stop_preview()
+            except Exception as e:
+                logger.warning(f"Error stopping camera preview: {e}")
+
+
+def stop():
+    """Release the camera."""
+    global _picam2, _reader
+    stop_preview()
+    with _lock:
+        if _reader is not None:
+            _reader.close()
+            _reader = None
+        if _picam2 is None:
+            return
+        try:
+            _picam2.stop()
+            _picam2.close()
+        except Exception as e:
+            logger.error(f"Error stopping camera service: {e}")
+        _picam2 = None
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Commands waiting beyond this are dropped; spoken commands go stale fast
+MAX_QUEUED = 8
+WORKERS = 3
+
+# Running commands allowed per intent unless start() says otherwise
+DEFAULT_LIMIT = 1
+
+_pending = deque()
+_running = {}  # intent -> list of running commands
+_condition = threading.Condition()
+_workers = []
+_stopping = threading.Event()
+_limits = {}
+_supersedes = {}
+_local = threading.local()
+_stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0,
+          "dropped": 0, "max_depth": 0, "wait_time": 0.0}
+
+
+class _Command:
+    def __init__(self, intent, func, args):
+        self.intent = intent
+        self.func = func
+        self.args = args
+        self.future = Future()
+        self.cancel_event = threading.Event()
+        self.queued_at = time.monotonic()
+
+
+def _limit(intent):
+    return _limits.get(intent, DEFAULT_LIMIT)
+
+
+def _next_command():
+    """Pop the oldest command whose intent is under its limit, or None."""
+    for command in _pending:
+        if len(_running.get(command.intent, ())) < _limit(command.intent):
+            _pending.remove(command)
+            return command
+    return None
+
+
+def _run():
+    """Worker loop: run queued commands, respecting per-intent limits."""
+    while True:
+        with _condition:
+            command = None
+            while not _stopping.is_set():
+                command = _next_command()
+                if command is not None:
+                    break
+                _condition.wait()
+            if command is None:
+                return
+            _running.setdefault(command.intent, []).append(command)
+            _stats["wait_time"] += time.monotonic() - command.queued_at
+
+        outcome = "cancelled"
+        if command.future.set_running_or_notify_cancel():
+            _local.command = command
+            try:
+                command.future.set_result(command.func(*command.args))
+                outcome = "completed"
+            except Exception as e:
+                logger.error(f"Command {command.intent} failed: {e}")
+                outcome = "failed"
+                command.future.set_exception(e)
+            finally:
+                _local.command = None
+
+        with _condition:
+            _stats[outcome] += 1
+            _running[command.intent].remove(command)
+            _condition.notify_all()
+
+
+def start(workers=WORKERS, limits=None, supersedes=None):
+    """Start the worker pool.
+
+    limits maps an intent to how many of its commands may run at once.
+    supersedes maps an intent to the intents a new command of that kind
+    cancels; every intent also supersedes older commands of its own kind
+    unless it is listed in limits with a limit above one.
+    """
+    _limits.clear()
+    _limits.update(limits or {})
+    _supersedes.clear()
+    _supersedes.update(supersedes or {})
+    _stopping.clear()
+    while len(_workers) < workers:
+        worker = threading.Thread(target=_run, name=f"command-{len(_workers)}", daemon=True)
+        _workers.append(worker)
+        worker.start()
+
+
+def _cancel_superseded(intent):
+    targets = set(_supersedes.get(intent, ()))
+    if _limit(intent) <= 1:
+        targets.add(intent)
+    cancelled = 0
+    for command in list(_pending):
+        if command.intent in targets:
+            _pending.remove(command)
+            command.cancel_event.set()
+            command.future.cancel()
+            cancelled += 1
+    for target in targets:
+        for command in _running.get(target, ()):
+            command.cancel_event.set()
+    return cancelled
+
+
+def submit(intent, func, *args):
+    """Queue func(*args) as a command for intent and return a Future.
+
+    Older commands the new one supersedes are cancelled: queued ones are
+    dropped, running ones see cancelled() turn True. When the queue is full
+    the new command is dropped and its future is cancelled.
+    """
+    command = _Command(intent, func, args)
+    with _condition:
+        _stats["submitted"] += 1
+        superseded = _cancel_superseded(intent)
+        _stats["cancelled"] += superseded
+        if superseded:
+            logger.info(f"Cancelled {superseded} queued command(s) superseded by {intent}")
+        if len(_pending) >= MAX_QUEUED:
+            _stats["dropped"] += 1
+            logger.warning(f"Command queue full, dropping {intent}")
+            command.future.cancel()
+            return command.future
+        _pending.append(command)
+        depth = len(_pending)
+        _stats["max_depth"] = max(_stats["max_depth"], depth)
+        _condition.notify()
+    logger.debug(f"Queued {intent} (depth {depth})")
+    return command.future
+
+
+def cancelled():
+    """True if the command running on this thread has been superseded."""
+    command = getattr(_local, "command", None)
+    return command is not None and command.cancel_event.is_set()
+
+
+def depth():
+    """Number of commands waiting to run."""
+    with _condition:
+        return len(_pending)
+
+
+def stats():
+    """Queue metrics: counters, current depth and running commands."""
+    with _condition:
+        result = dict(_stats)
+        result["depth"] = len(_pending)
+        result["running"] = {intent: len(commands) for intent, commands in _running.items() if commands}
+    started = result["completed"] + result["failed"]
+    result["avg_wait"] = result.pop("wait_time") / started if started else 0.0
+    return result
+
+
+def stop(timeout=2):
+    """Stop the workers, dropping anything still queued."""
+    with _condition:
+        _stopping.set()
+        while _pending:
+            command = _pending.popleft()
+            command.future.cancel()
+            _stats["cancelled"] += 1
+        _condition.notify_all()
+    for worker in _workers:
+        worker.join(timeout=timeout)
+    _workers.clear()
@@ -0,0 +1,337 @@
+"""Shared camera frames for the assistant and the vision games.
+
+One producer process owns the camera and publishes every frame into a
+multiprocessing.shared_memory ring buffer. Any number of consumers attach
+to it and read the latest frame as a NumPy view without copying.
+
+Run the producer with:  python frame_bus.py
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import subprocess
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BUS_NAME = "homi_frames"
+# width, height; full resolution, since homework stills for OCR come from here too
+FRAME_SIZE = (1920, 1080)
+CHANNELS = 3
+SLOTS = 4
+
+MAGIC = 0x484F4D49  # "HOMI"
+
+# Header words: magic, width, height, channels, slots, latest seq, producer pid, spare
+_HEADER_FIXED = 8
+_LATEST = 5
+_PID = 6
+_ALIGN = 64
+
+
+def _layout(width, height, channels, slots):
+    """Return (header_bytes, frame_bytes, total_bytes) for a bus shape."""
+    header_bytes = (_HEADER_FIXED + slots) * 8
+    header_bytes = (header_bytes + _ALIGN - 1) // _ALIGN * _ALIGN
+    frame_bytes = width * height * channels
+    return header_bytes, frame_bytes, header_bytes + frame_bytes * slots
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process unlink it on exit."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # Consumers must not tear down the producer's segment when they exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class FrameWriter:
+    """Producer side of the bus. Creates the shared memory segment."""
+
+    def __init__(self, name=BUS_NAME, size=FRAME_SIZE, channels=CHANNELS, slots=SLOTS):
+        width, height = size
+        header_bytes, self.frame_bytes, total = _layout(width, height, channels, slots)
+        try:
+            # Clear out a segment left behind by a producer that crashed
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=total)
+        self.header = np.ndarray((_HEADER_FIXED + slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.header[:] = 0
+        self.header[:_PID + 1] = [MAGIC, width, height, channels, slots, 0, os.getpid()]
+        self.slot_seq = self.header[_HEADER_FIXED:]
+        self.slot_seq[:] = -1
+        self.frames = np.ndarray((slots, height, width, channels), dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=header_bytes)
+        self.slots = slots
+        self.seq = 0
+
+    def publish(self, frame):
+        """Copy frame into the next slot and make it the latest. Returns its sequence number."""
+        seq = self.seq + 1
+        slot = seq % self.slots
+        self.slot_seq[slot] = -1  # mark the slot as being written
+        np.copyto(self.frames[slot], frame[:, :, :self.frames.shape[3]], casting="unsafe")
+        self.slot_seq[slot] = seq
+        self.header[_LATEST] = seq
+        self.seq = seq
+        return seq
+
+    def close(self):
+        self.header[_LATEST] = 0
+        del self.header, self.slot_seq, self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FrameReader:
+    """Consumer side of the bus.
+
+    latest() returns a read-only view straight into shared memory. The
+    producer only reuses that slot after SLOTS - 1 newer frames, so the
+    view is safe to process for a few frame intervals; use latest_copy()
+    to keep a frame for longer.
+    """
+
+    def __init__(self, name=BUS_NAME):
+        self.shm = _attach(name)
+        fixed = np.ndarray((_HEADER_FIXED,), dtype=np.int64, buffer=self.shm.buf)
+        if fixed[0] != MAGIC:
+            del fixed
+            self.shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a frame bus")
+        width, height, channels, slots = (int(v) for v in fixed[1:5])
+        header_bytes, _, _ = _layout(width, height, channels, slots)
+        self.header = np.ndarray((_HEADER_FIXED + slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.slot_seq = self.header[_HEADER_FIXED:]
+        self.frames = np.ndarray((slots, height, width, channels), dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=header_bytes)
+        self.frames.flags.writeable = False
+        self.size = (width, height)
+        self.slots = slots
+
+    def producer_alive(self):
+        pid = int(self.header[_PID])
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+    def latest(self):
+        """Return (seq, frame view) for the newest complete frame, or (0, None)."""
+        seq = int(self.header[_LATEST])
+        if seq <= 0:
+            return 0, None
+        slot = seq % self.slots
+        if self.slot_seq[slot] != seq:
+            # The producer lapped us while we looked; fall back to the previous slot
+            seq -= 1
+            slot = seq % self.slots
+            if seq <= 0 or self.slot_seq[slot] != seq:
+                return 0, None
+        return seq, self.frames[slot]
+
+    def latest_copy(self):
+        """Like latest() but returns a private copy, checked against a concurrent overwrite."""
+        while True:
+            seq, view = self.latest()
+            if view is None:
+                return 0, None
+            frame = view.copy()
+            if self.slot_seq[seq % self.slots] == seq:
+                return seq, frame
+
+    def wait_next(self, last_seq, timeout=1.0):
+        """Block until a frame newer than last_seq arrives. Returns (seq, view) or (last_seq, None)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if int(self.header[_LATEST]) > last_seq:
+                return self.latest()
+            time.sleep(0.002)
+        return last_seq, None
+
+    def close(self):
+        del self.header, self.slot_seq, self.frames
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a frame view; the mapping goes with the process
+            pass
+
+
+class BusCapture:
+    """cv2.VideoCapture look-alike backed by the frame bus, for the games."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.last_seq = 0
+
+    def isOpened(self):
+        return self.reader is not None
+
+    def read(self):
+        seq, frame = self.reader.wait_next(self.last_seq)
+        if frame is None:
+            return False, None
+        self.last_seq = seq
+        return True, frame
+
+    def set(self, prop_id, value):
+        # The producer decides the resolution; games resize what they get
+        return False
+
+    def release(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+
+def open_reader(name=BUS_NAME):
+    """Attach to a running bus, or return None if there is no producer."""
+    try:
+        reader = FrameReader(name)
+    except (FileNotFoundError, ValueError):
+        return None
+    if not reader.producer_alive():
+        reader.close()
+        return None
+    return reader
+
+
+class PicameraCapture:
+    """cv2.VideoCapture look-alike over Picamera2, for when there is no bus."""
+
+    def __init__(self, size=FRAME_SIZE):
+        self.picam2 = _start_picamera(size)
+
+    def isOpened(self):
+        return self.picam2 is not None
+
+    def read(self):
+        frame = self.picam2.capture_array()
+        return frame is not None, frame
+
+    def set(self, prop_id, value):
+        # Configured at start like the producer; games resize what they get
+        return False
+
+    def release(self):
+        if self.picam2 is not None:
+            self.picam2.stop()
+            self.picam2.close()
+            self.picam2 = None
+
+
+def open_capture(index=0):
+    """Return a capture reading from the bus, or straight from the camera without one.
+
+    The Pi's CSI camera does not give frames through cv2.VideoCapture, so
+    Picamera2 is used when it is installed, configured like the producer.
+    """
+    reader = open_reader()
+    if reader is not None:
+        return BusCapture(reader)
+    try:
+        return PicameraCapture()
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning(f"Picamera2 unavailable, trying camera {index}: {e}")
+    import cv2
+    return cv2.VideoCapture(index)
+
+
+def start_producer(timeout=10.0):
+    """Launch the producer process and wait for its first frame.
+
+    Returns the Popen handle, or None if no frame arrived in time.
+    """
+    python_cmd = sys.executable if sys.executable else "python3"
+    script = os.path.abspath(__file__)
+    process = subprocess.Popen([python_cmd, script])
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        reader = open_reader()
+        if reader is not None:
+            seq, _ = reader.latest()
+            reader.close()
+            if seq > 0:
+                logger.info(f"Frame bus producer running with PID {process.pid}")
+                return process
+        time.sleep(0.1)
+    logger.error("Frame bus producer did not start")
+    if process.poll() is None:
+        process.terminate()
+    return None
+
+
+def _start_picamera(size):
+    """Open and start Picamera2 streaming frames of size. Raises ImportError without it."""
+    from picamera2 import Picamera2
+    picam2 = Picamera2()
+    config = picam2.create_video_configuration(main={"size": size, "format": "RGB888"})
+    picam2.configure(config)
+    picam2.start()
+    return picam2
+
+
+def _open_camera(size):
+    """Yield frames from Picamera2, or from cv2.VideoCapture(0) without it."""
+    try:
+        picam2 = _start_picamera(size)
+    except ImportError:
+        picam2 = None
+
+    if picam2 is not None:
+        try:
+            while True:
+                yield picam2.capture_array()
+        finally:
+            picam2.stop()
+    else:
+        import cv2
+        cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        try:
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if frame.shape[1::-1] != tuple(size):
+                    frame = cv2.resize(frame, size)
+                yield frame
+        finally:
+            cap.release()
+
+
+def run_producer(size=FRAME_SIZE):
+    """Own the camera and publish frames until interrupted."""
+    writer = FrameWriter(size=size)
+    # Let terminate() from the assistant run the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info(f"Publishing {size[0]}x{size[1]} frames on '{BUS_NAME}'")
+    try:
+        for frame in _open_camera(size):
+            if frame is not None:
+                writer.publish(frame)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_producer()
@@ -0,0 +1,105 @@
+"""Compare time-to-first-frame of cold game launches with zygote forks.
+
+Usage: python game_launch_benchmark.py [--runs N] game.py [game2.py ...]
+
+For every game, launches it N times as a fresh interpreter (what
+launch_file used to do) and N times forked from a preloaded game_zygote,
+and prints the median time from the launch request to the game's first
+cv2.imshow call. Run it with the assistant stopped so the camera is free.
+"""
+import os
+import sys
+import time
+import logging
+import statistics
+import subprocess
+import tempfile
+
+import game_zygote
+
+FIRST_FRAME_TIMEOUT = 60
+BENCH_SOCKET = "/tmp/homi_zygote_bench.sock"
+
+
+def wait_first_frame(process, marker, start):
+    """Seconds from start until the game shows its first frame, or None."""
+    deadline = time.monotonic() + FIRST_FRAME_TIMEOUT
+    while time.monotonic() < deadline:
+        if os.path.exists(marker) and os.path.getsize(marker):
+            with open(marker) as f:
+                return float(f.read()) - start
+        if process.poll() is not None:
+            return None
+        time.sleep(0.01)
+    return None
+
+
+def stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def cold_launch(script, marker):
+    python_cmd = sys.executable if sys.executable else "python3"
+    env = dict(os.environ, **{game_zygote.FIRST_FRAME_ENV: marker})
+    start = time.time()
+    process = subprocess.Popen([python_cmd, game_zygote.__file__, "--run", script], env=env)
+    return process, start
+
+
+def zygote_launch(script, marker):
+    start = time.time()
+    process = game_zygote.spawn(script, env={game_zygote.FIRST_FRAME_ENV: marker},
+                                socket_path=BENCH_SOCKET)
+    return process, start
+
+
+def measure(launch, script, runs):
+    times = []
+    for _ in range(runs):
+        marker = tempfile.mktemp(prefix="first_frame_")
+        process, start = launch(script, marker)
+        if process is None:
+            break
+        elapsed = wait_first_frame(process, marker, start)
+        stop(process)
+        if os.path.exists(marker):
+            os.remove(marker)
+        if elapsed is not None:
+            times.append(elapsed)
+    return times
+
+
+def main(paths, runs):
+    zygote = game_zygote.start(wait=FIRST_FRAME_TIMEOUT, socket_path=BENCH_SOCKET)
+    try:
+        print(f"{'game':32} {'cold':>8} {'zygote':>8} {'saved':>8}")
+        for path in paths:
+            cold = measure(cold_launch, path, runs)
+            forked = measure(zygote_launch, path, runs)
+            if not cold or not forked:
+                print(f"{os.path.basename(path)[:32]:32} no frame shown "
+                      f"(cold {len(cold)}/{runs}, zygote {len(forked)}/{runs})")
+                continue
+            cold_median = statistics.median(cold)
+            forked_median = statistics.median(forked)
+            print(f"{os.path.basename(path)[:32]:32} {cold_median:7.2f}s {forked_median:7.2f}s "
+                  f"{cold_median - forked_median:7.2f}s")
+    finally:
+        stop(zygote)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = sys.argv[1:]
+    runs = 3
+    if len(args) >= 2 and args[0] == "--runs":
+        runs = int(args[1])
+        args = args[2:]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    main(args, runs)
@@ -0,0 +1,295 @@
+import time
+import random
+
+import cv2
+
+from game_runtime import Game, register
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Face mesh landmark for each part the child is asked to touch
+BODY_PARTS = {
+    "left eye": 33,
+    "right eye": 263,
+    "nose": 1,
+    "mouth": 13,
+    "left ear": 234,
+    "right ear": 454
+}
+
+WIN_SCORE = 10
+END_DELAY = 3  # seconds to show "Well Done!" before closing
+
+
+def euclidean_distance(p1, p2):
+    return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
+
+
+def detect_color(h, s, v):
+    """Return color name based on HSV pixel."""
+    if v <= 50:
+        return "Black"
+    elif s <= 50 and v >= 200:
+        return "White"
+    elif s <= 50:
+        return "Gray"
+    elif h < 5 or h >= 178:
+        return "Red"
+    elif h < 22:
+        return "Orange"
+    elif h < 33:
+        return "Yellow"
+    elif h < 78:
+        return "Green"
+    elif h < 131:
+        return "Blue"
+    else:
+        return "Violet"
+
+
+def face_and_fingertip(face_mesh, hands, frame, target_index):
+    """Pixel positions of a face landmark and the index fingertip, or None."""
+    h, w = frame.shape[:2]
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    face_results = face_mesh.process(rgb)
+    hand_results = hands.process(rgb)
+    if not face_results.multi_face_landmarks or not hand_results.multi_hand_landmarks:
+        return None
+    target = face_results.multi_face_landmarks[0].landmark[target_index]
+    fingertip = hand_results.multi_hand_landmarks[0].landmark[8]
+    return (int(target.x * w), int(target.y * h)), (int(fingertip.x * w), int(fingertip.y * h))
+
+
+@register("face_parts_practice")
+class FacePartsPractice(Game):
+    """Point at the named face part; endless practice (face_parts_quiz.py)."""
+
+    title = "Body Parts Quiz"
+    size = (640, 480)
+
+    def init(self, host):
+        self.face_mesh = host.model("face_mesh")
+        self.hands = host.model("hands")
+        self.question = random.choice(list(BODY_PARTS))
+        self.points = None
+        self.correct = False
+
+    def start(self):
+        self.last_switch_time = time.time()
+
+    def step(self, frame):
+        self.points = face_and_fingertip(self.face_mesh, self.hands, frame, BODY_PARTS[self.question])
+        self.correct = False
+        if self.points:
+            target_xy, finger_xy = self.points
+            self.correct = euclidean_distance(finger_xy, target_xy) < 40
+            # Switch to next question after 2 seconds
+            if self.correct and time.time() - self.last_switch_time > 2:
+                self.question = random.choice(list(BODY_PARTS))
+                self.last_switch_time = time.time()
+
+    def render(self, frame):
+        cv2.putText(frame, f"Show me your {self.question}!", (30, 50), FONT, 1.2, (255, 255, 0), 3)
+        if self.points:
+            target_xy, finger_xy = self.points
+            cv2.circle(frame, target_xy, 6, (0, 0, 255), -1)
+            cv2.circle(frame, finger_xy, 8, (0, 255, 0), -1)
+            if self.correct:
+                cv2.putText(frame, "Correct!", (30, 100), FONT, 1.2, (0, 255, 0), 3)
+            else:
+                cv2.putText(frame, "Try again!", (30, 100), FONT, 1.2, (0, 0, 255), 3)
+        return frame
+
+
+@register("face_parts_quiz")
+class FacePartsQuiz(Game):
+    """Touch the named face part and hold it; ten right wins (FinalFacePartsQuiz.py)."""
+
+    title = "Body Parts Quiz"
+    DIST_THRESHOLD = 40
+    STABILITY_FRAMES = 10
+    GRACE_PERIOD = 1.5
+
+    def init(self, host):
+        self.face_mesh = host.model("face_mesh_tracking")
+        self.hands = host.model("hands_tracking")
+        self.question = random.choice(list(BODY_PARTS))
+        self.stable_counter = 0
+        self.score = 0
+        self.end_time = None
+        self.points = None
+        self.correct = False
+
+    def start(self):
+        self.last_switch_time = time.time()
+        self.just_switched = True
+
+    def step(self, frame):
+        self.points = None
+        if self.end_time is not None:
+            return time.time() - self.end_time <= END_DELAY
+        # Grace period after switching question
+        if self.just_switched and time.time() - self.last_switch_time < self.GRACE_PERIOD:
+            return True
+        self.just_switched = False
+
+        self.points = face_and_fingertip(self.face_mesh, self.hands, frame, BODY_PARTS[self.question])
+        if not self.points:
+            return True
+        target_xy, finger_xy = self.points
+        self.correct = euclidean_distance(finger_xy, target_xy) < self.DIST_THRESHOLD
+        self.stable_counter = self.stable_counter + 1 if self.correct else 0
+
+        # Enough stability -> correct
+        if self.stable_counter >= self.STABILITY_FRAMES and time.time() - self.last_switch_time > 1:
+            self.score += 1
+            self.stable_counter = 0
+            if self.score >= WIN_SCORE:
+                self.end_time = time.time()
+            else:
+                self.question = random.choice(list(BODY_PARTS))
+                self.last_switch_time = time.time()
+                self.just_switched = True
+        return True
+
+    def render(self, frame):
+        h, w = frame.shape[:2]
+        if self.end_time is not None:
+            cv2.putText(frame, "WELL DONE!", (int(w / 4), int(h / 2)), FONT, 1.7, (0, 255, 0), 5)
+            return frame
+        cv2.putText(frame, f"Touch your {self.question}!", (30, 50), FONT, 1, (255, 255, 0), 3)
+        cv2.putText(frame, f"Score: {self.score}", (w - 200, 50), FONT, 1, (0, 255, 255), 3)
+        if self.points:
+            target_xy, finger_xy = self.points
+            cv2.circle(frame, target_xy, 6, (0, 0, 255), -1)
+            cv2.circle(frame, finger_xy, 8, (0, 255, 0), -1)
+            if self.correct:
+                cv2.putText(frame, "Correct!", (30, 100), FONT, 1.2, (0, 255, 0), 3)
+            else:
+                cv2.putText(frame, "Wrong!", (30, 100), FONT, 1.2, (0, 0, 255), 3)
+        return frame
+
+
+@register("finger_counting_quiz")
+class FingerCountingQuiz(Game):
+    """Show the asked number of fingers; ten right wins (FinalFingerCountingQuiz.py)."""
+
+    title = "Finger Counting Quiz"
+    SWITCH_DELAY = 1.5
+
+    def init(self, host):
+        self.detector = host.model("hand_detector")
+        self.target_number = random.randint(1, 10)
+        self.score = 0
+        self.show_correct = False
+        self.last_correct_time = 0
+        self.end_time = None
+        self.hands = []
+        self.total_fingers = 0
+
+    def step(self, frame):
+        if self.end_time is not None:
+            return time.time() - self.end_time <= END_DELAY
+        # findHands draws the hand skeleton onto the frame
+        self.hands, _ = self.detector.findHands(frame, flipType=False)
+        self.total_fingers = sum(self.detector.fingersUp(hand).count(1) for hand in self.hands or [])
+
+        if self.hands and not self.show_correct and self.total_fingers == self.target_number:
+            self.score += 1
+            self.show_correct = True
+            self.last_correct_time = time.time()
+        if self.show_correct and time.time() - self.last_correct_time > self.SWITCH_DELAY:
+            self.target_number = random.randint(1, 10)
+            self.show_correct = False
+        if self.score >= WIN_SCORE:
+            self.end_time = time.time()
+        return True
+
+    def render(self, frame):
+        h, w = frame.shape[:2]
+        if self.end_time is not None:
+            cv2.putText(frame, "WELL DONE!", (int(w / 5), int(h / 2)), FONT, 1.7, (0, 255, 0), 5)
+            return frame
+        cv2.putText(frame, f"Show me {self.target_number} fingers!", (30, 60), FONT, 1.2, (255, 255, 0), 3)
+        cv2.putText(frame, f"Score: {self.score}", (w - 200, 60), FONT, 1.2, (0, 255, 255), 3)
+        if self.hands:
+            cv2.putText(frame, f"You showed: {self.total_fingers}", (30, 120), FONT, 1.0, (0, 255, 0), 3)
+            # Wrong answer, but ignore 0 fingers
+            if not self.show_correct and self.total_fingers not in (0, self.target_number):
+                cv2.putText(frame, "Wrong!", (30, 180), FONT, 1.2, (0, 0, 255), 3)
+        if self.show_correct:
+            cv2.putText(frame, "Correct!", (30, 180), FONT, 1.2, (0, 255, 0), 3)
+        return frame
+
+
+@register("color_quiz")
+class ColorQuiz(Game):
+    """Hold the asked colour in the middle of the picture (ColorQuiz0.py)."""
+
+    title = "Color Quiz"
+    mirror = False
+    COLORS = ["Red", "Orange", "Yellow", "Green", "Blue", "Violet", "Black", "White", "Gray"]
+    QUIZ_DURATION = 5
+
+    def init(self, host):
+        self.score = 0
+        self.target_color = random.choice(self.COLORS)
+        self.end_time = None
+        self.detected_color = None
+
+    def start(self):
+        self.last_switch_time = time.time()
+
+    def step(self, frame):
+        if self.end_time is not None:
+            return time.time() - self.end_time <= END_DELAY
+        h, w = frame.shape[:2]
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        self.detected_color = detect_color(*hsv[h // 2, w // 2])
+        # Check if it's time to switch question
+        if time.time() - self.last_switch_time > self.QUIZ_DURATION:
+            if self.detected_color == self.target_color:
+                self.score += 1
+                if self.score >= WIN_SCORE:
+                    self.end_time = time.time()
+            self.target_color = random.choice(self.COLORS)
+            self.last_switch_time = time.time()
+        return True
+
+    def render(self, frame):
+        h, w = frame.shape[:2]
+        cv2.circle(frame, (w // 2, h // 2), 10, (255, 0, 0), 3)
+        if self.end_time is not None:
+            cv2.putText(frame, "  WELL DONE!", (w // 5, h // 2), FONT, 1.5, (0, 255, 0), 5)
+            return frame
+        cv2.putText(frame, f"Target: {self.target_color}", (20, 50), FONT, 1, (0, 255, 0), 2)
+        cv2.putText(frame, f"Detected: {self.detected_color}", (20, 100), FONT, 1, (0, 0, 255), 2)
+        cv2.putText(frame, f"Score: {self.score}", (20, 150), FONT, 1, (255, 255, 0), 2)
+        if self.detected_color == self.target_color:
+            cv2.putText(frame, "Right!", (20, 210), FONT, 1.2, (0, 255, 0), 3)
+        else:
+            cv2.putText(frame, "Try Again!", (20, 210), FONT, 1.2, (0, 0, 255), 3)
+        return frame
+
+
+@register("color_picker")
+class ColorPicker(Game):
+    """Name the colour in the middle of the picture (color.py)."""
+
+    title = "frame"
+    size = (1280, 720)
+    mirror = False
+
+    def init(self, host):
+        self.color = None
+
+    def step(self, frame):
+        h, w = frame.shape[:2]
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        self.color = detect_color(*hsv[h // 2, w // 2])
+
+    def render(self, frame):
+        h, w = frame.shape[:2]
+        cv2.putText(frame, self.color, (10, 50), FONT, 1, (0, 0, 255), 2)
+        cv2.circle(frame, (w // 2, h // 2), 5, (255, 0, 0), 3)
+        return frame
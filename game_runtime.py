@@ -0,0 +1,363 @@
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+import subprocess
+
+import cv2
+
+import frame_bus
+import game_zygote
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = "/tmp/homi_games.sock"
+
+# Models built when the host starts, so the first game does not wait
+WARM_MODELS = ["face_mesh", "hands", "face_mesh_tracking", "hands_tracking", "hand_detector"]
+
+# Keys that end a game: ESC and q
+QUIT_KEYS = (27, ord("q"))
+
+# Game name -> Game subclass, filled in by game_plugins
+GAMES = {}
+
+
+def register(name):
+    """Class decorator adding a Game subclass to GAMES under name."""
+    def add(game_class):
+        game_class.name = name
+        GAMES[name] = game_class
+        return game_class
+    return add
+
+
+class Game:
+    """A camera game run inside the GameHost.
+
+    The host calls init() once to load the game, possibly ahead of time
+    while it is only prepared, and start() when its window is shown, so
+    clocks and timers belong in start(). Then for every camera frame it
+    calls step() to update the game state and render() to draw it, and
+    teardown() when the game ends or another one replaces it. Frames are
+    BGR arrays already resized to size and mirrored if mirror is set.
+    Models come from host.model(), which shares one instance of each
+    between all games.
+    """
+
+    name = None
+    title = "Homi"
+    size = (800, 480)
+    mirror = True
+
+    def init(self, host):
+        pass
+
+    def start(self):
+        pass
+
+    def step(self, frame):
+        """Update the game from a frame; return False once the game is over."""
+        return True
+
+    def render(self, frame):
+        """Return the image to show for this frame."""
+        return frame
+
+    def teardown(self):
+        pass
+
+
+class GameHost:
+    """Runs one game at a time over a shared camera and shared models.
+
+    play() and stop() may be called from any thread; the switch happens
+    on the host thread between two frames, so changing games only costs
+    the new game's init(). prepare() runs that init() ahead of time
+    without showing anything, and a later play() of the same game just
+    opens its window.
+    """
+
+    def __init__(self):
+        import game_plugins  # registers the games
+
+        self.capture = None
+        self.game = None
+        self.prepared = None
+        self._models = {}
+        self._requested = None
+        self._prepare_requested = None
+        self._request_time = None
+        self._lock = threading.Lock()
+        self._running = True
+        self._windows_opened = False
+
+    def model(self, name):
+        """Return the shared instance of a model, building it on first use."""
+        if name not in self._models:
+            start = time.monotonic()
+            self._models[name] = game_zygote.model(name)
+            logger.info(f"Built model {name} in {time.monotonic() - start:.2f}s")
+        return self._models[name]
+
+    def warm(self, names=WARM_MODELS):
+        for name in names:
+            try:
+                self.model(name)
+            except Exception as e:
+                logger.warning(f"Could not build model {name}: {e}")
+
+    def play(self, name):
+        if name not in GAMES:
+            raise KeyError(f"Unknown game: {name}")
+        with self._lock:
+            self._requested = name
+            self._request_time = time.monotonic()
+
+    def prepare(self, name):
+        if name not in GAMES:
+            raise KeyError(f"Unknown game: {name}")
+        with self._lock:
+            self._prepare_requested = name
+
+    def discard(self):
+        with self._lock:
+            self._prepare_requested = ""
+
+    def stop(self):
+        with self._lock:
+            self._requested = ""
+            self._request_time = time.monotonic()
+
+    def quit(self):
+        self._running = False
+
+    def current(self):
+        return self.game.name if self.game is not None else None
+
+    def _open_capture(self):
+        if self.capture is None:
+            self.capture = frame_bus.open_capture(0)
+
+    def _release_capture(self):
+        # Frames from the bus stay attached; a camera opened directly is
+        # given back so the assistant can take photos
+        if self.capture is not None and not isinstance(self.capture, frame_bus.BusCapture):
+            self.capture.release()
+            self.capture = None
+
+    def _prepare(self, name):
+        # Attach to the frame bus only: a camera opened directly would be
+        # taken from the assistant before the child has chosen the game
+        if self.capture is None:
+            reader = frame_bus.open_reader()
+            if reader is not None:
+                self.capture = frame_bus.BusCapture(reader)
+        start = time.monotonic()
+        game = GAMES[name]()
+        game.init(self)
+        self.prepared = game
+        logger.info(f"Prepared {name} in {time.monotonic() - start:.3f}s")
+
+    def _discard_prepared(self):
+        if self.prepared is None:
+            return
+        try:
+            self.prepared.teardown()
+        except Exception as e:
+            logger.error(f"Error discarding {self.prepared.name}: {e}")
+        logger.info(f"Discarded prepared {self.prepared.name}")
+        self.prepared = None
+
+    def _end_game(self):
+        if self.game is None:
+            return
+        try:
+            self.game.teardown()
+        except Exception as e:
+            logger.error(f"Error ending {self.game.name}: {e}")
+        cv2.destroyWindow(self.game.title)
+        # HighGUI only removes the window when its event loop runs; the host
+        # stays alive, so run it here instead of leaving a frozen frame
+        cv2.waitKey(1)
+        logger.info(f"Stopped {self.game.name}")
+        self.game = None
+
+    def _apply_request(self):
+        with self._lock:
+            requested, self._requested = self._requested, None
+            prepare, self._prepare_requested = self._prepare_requested, None
+        if prepare is not None:
+            self._discard_prepared()
+            if prepare:
+                self._prepare(prepare)
+        if requested is None:
+            return
+        self._end_game()
+        if not requested:
+            self._discard_prepared()
+            self._release_capture()
+            return
+        self._open_capture()
+        if self.prepared is not None and self.prepared.name == requested:
+            game, self.prepared = self.prepared, None
+        else:
+            self._discard_prepared()
+            game = GAMES[requested]()
+            game.init(self)
+        # A prepared game may have been waiting a while; its clocks start now
+        game.start()
+        self.game = game
+        cv2.namedWindow(game.title, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(game.title, *game.size)
+        self._windows_opened = True
+
+    def run_once(self):
+        """Process one frame of the current game. Returns False when it ended."""
+        self._apply_request()
+        if self.game is None:
+            if self._windows_opened:
+                # Keep HighGUI's event loop running between games
+                cv2.waitKey(1)
+            time.sleep(0.02)
+            return True
+        ok, frame = self.capture.read()
+        if not ok or frame is None:
+            time.sleep(0.01)
+            return True
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[:, :, :3]
+        frame = cv2.resize(frame, self.game.size)
+        if self.game.mirror:
+            frame = cv2.flip(frame, 1)
+        keep_going = self.game.step(frame) is not False
+        cv2.imshow(self.game.title, self.game.render(frame))
+        if self._request_time is not None:
+            logger.info(f"{self.game.name} showing after {time.monotonic() - self._request_time:.3f}s")
+            self._request_time = None
+        key = cv2.waitKey(1) & 0xFF
+        if key in QUIT_KEYS or not keep_going:
+            self._end_game()
+            self._release_capture()
+            return False
+        return True
+
+    def run(self):
+        while self._running:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Game host error: {e}")
+                self._end_game()
+        self.close()
+
+    def close(self):
+        self._discard_prepared()
+        self._end_game()
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        cv2.destroyAllWindows()
+
+
+def _handle(host, request):
+    command = request.get("command")
+    if command == "play":
+        host.play(request["game"])
+    elif command == "prepare":
+        host.prepare(request["game"])
+    elif command == "discard":
+        host.discard()
+    elif command == "stop":
+        host.stop()
+    elif command == "quit":
+        host.quit()
+    elif command != "status":
+        raise ValueError(f"Unknown command: {command}")
+    return {"ok": True, "game": host.current()}
+
+
+def _control_loop(host, listener):
+    while True:
+        connection, _ = listener.accept()
+        with connection:
+            try:
+                request = json.loads(connection.makefile().readline())
+                reply = _handle(host, request)
+            except (KeyError, ValueError) as e:
+                reply = {"ok": False, "error": str(e)}
+            connection.sendall(json.dumps(reply).encode() + b"\n")
+
+
+def serve(socket_path=SOCKET_PATH):
+    """Run the host, taking play/prepare/discard/stop/quit commands on a Unix socket."""
+    host = GameHost()
+    tmp_path = f"{socket_path}.{os.getpid()}"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(tmp_path)
+    listener.listen(4)
+    threading.Thread(target=_control_loop, args=(host, listener), name="game-control",
+                     daemon=True).start()
+    host.warm()
+    os.replace(tmp_path, socket_path)
+    logger.info(f"Game host listening on {socket_path}")
+    try:
+        host.run()
+    finally:
+        listener.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def play_standalone(name):
+    """Run a single game in this process until it ends (for the old scripts)."""
+    host = GameHost()
+    host.play(name)
+    try:
+        while host.run_once() and host.game is not None:
+            pass
+    finally:
+        host.close()
+
+
+def send(command, game=None, socket_path=SOCKET_PATH, timeout=2.0):
+    """Send a command to a running host. Returns its reply, or None."""
+    request = {"command": command}
+    if game is not None:
+        request["game"] = game
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(timeout)
+            connection.connect(socket_path)
+            connection.sendall(json.dumps(request).encode() + b"\n")
+            return json.loads(connection.makefile().readline())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Game host unavailable: {e}")
+        return None
+
+
+def start(socket_path=SOCKET_PATH):
+    """Launch the host process; send() works once it has warmed up."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # left behind by a host that was killed
+    python_cmd = sys.executable if sys.executable else "python3"
+    process = subprocess.Popen([python_cmd, os.path.abspath(__file__), "--serve", socket_path])
+    logger.info(f"Game host starting with PID {process.pid}")
+    return process
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Run through the importable module so game_plugins registers into it
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import game_runtime
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        game_runtime.serve(sys.argv[2] if len(sys.argv) > 2 else SOCKET_PATH)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "--play":
+        game_runtime.play_standalone(sys.argv[2])
+    else:
+        print("Usage: game_runtime.py --serve [socket] | --play game")
@@ -0,0 +1,304 @@
+import os
+import sys
+import json
+import time
+import errno
+import runpy
+import signal
+import socket
+import logging
+import importlib
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = "/tmp/homi_zygote.sock"
+
+# Imported once in the zygote so every game starts with them loaded
+PRELOAD_MODULES = ["numpy", "cv2", "mediapipe", "cvzone.HandTrackingModule", "frame_bus",
+                   "game_runtime", "game_plugins"]
+
+# Model graphs can also be built ahead of time. MediaPipe starts worker
+# threads when a graph is built, and threads do not survive fork(), so
+# this is off unless it has been checked on the device.
+PRECONSTRUCT_MODELS = False
+
+# Set in a game's environment to have it write the time of its first
+# cv2.imshow call to this file (used by game_launch_benchmark.py)
+FIRST_FRAME_ENV = "HOMI_FIRST_FRAME_FILE"
+
+# Exit codes of reaped games (negative for a signal, as in Popen), so a
+# handle can tell a crash from a clean exit; only the newest are kept
+MAX_EXIT_CODES = 64
+_exit_codes = {}
+
+
+def _face_mesh():
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, max_num_faces=1)
+
+
+def _hands():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(max_num_hands=1)
+
+
+def _face_mesh_tracking():
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, max_num_faces=1,
+                                           min_detection_confidence=0.6, min_tracking_confidence=0.6)
+
+
+def _hands_tracking():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.6,
+                                    min_tracking_confidence=0.6)
+
+
+def _hand_detector():
+    from cvzone.HandTrackingModule import HandDetector
+    return HandDetector(detectionCon=0.7, maxHands=2)
+
+
+# Models the games use, by name
+MODEL_FACTORIES = {
+    "face_mesh": _face_mesh,
+    "hands": _hands,
+    "face_mesh_tracking": _face_mesh_tracking,
+    "hands_tracking": _hands_tracking,
+    "hand_detector": _hand_detector,
+}
+
+_models = {}
+
+
+def model(name):
+    """Return the named model, prebuilt by the zygote if it made one."""
+    if name in _models:
+        return _models.pop(name)
+    return MODEL_FACTORIES[name]()
+
+
+def preload(construct_models=PRECONSTRUCT_MODELS):
+    """Import the heavy modules (and optionally build the models) now."""
+    start = time.monotonic()
+    for name in PRELOAD_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Could not preload {name}: {e}")
+            continue
+        if name == "mediapipe":
+            # The solutions are imported lazily on first attribute access
+            module.solutions.face_mesh, module.solutions.hands
+    if construct_models:
+        for name, factory in MODEL_FACTORIES.items():
+            try:
+                _models[name] = factory()
+            except Exception as e:
+                logger.warning(f"Could not build model {name}: {e}")
+    logger.info(f"Zygote preloaded in {time.monotonic() - start:.2f}s")
+
+
+def _report_first_frame(path):
+    """Write the time of the game's first cv2.imshow call to path."""
+    import cv2
+    original = cv2.imshow
+
+    def imshow(*args, **kwargs):
+        cv2.imshow = original
+        with open(path, "w") as f:
+            f.write(repr(time.time()))
+        return original(*args, **kwargs)
+
+    cv2.imshow = imshow
+
+
+def run_game(script, args=()):
+    """Run a game script as __main__ in this process."""
+    script = os.path.abspath(script)
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, os.path.dirname(script))
+    if os.environ.get(FIRST_FRAME_ENV):
+        _report_first_frame(os.environ[FIRST_FRAME_ENV])
+    runpy.run_path(script, run_name="__main__")
+
+
+def _child(connection, listener, request):
+    """Runs in the forked child: become the game."""
+    try:
+        listener.close()
+        connection.close()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.setpgid(0, 0)
+        os.chdir(request.get("cwd") or os.getcwd())
+        os.environ.update(request.get("env") or {})
+        run_game(request["script"], request.get("args", ()))
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 0
+    except BaseException as e:
+        print(f"Game error: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+def _reap(signum, frame):
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        _exit_codes[pid] = os.waitstatus_to_exitcode(status)
+        while len(_exit_codes) > MAX_EXIT_CODES:
+            del _exit_codes[next(iter(_exit_codes))]
+
+
+def serve(socket_path=SOCKET_PATH):
+    """Preload, then fork a ready child for every launch request."""
+    preload()
+    signal.signal(signal.SIGCHLD, _reap)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # Bind under a temporary name and rename, so the socket path only
+    # exists once the zygote is accepting launches
+    tmp_path = f"{socket_path}.{os.getpid()}"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(tmp_path)
+    listener.listen(4)
+    os.replace(tmp_path, socket_path)
+    logger.info(f"Game zygote listening on {socket_path}")
+    try:
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except InterruptedError:
+                continue
+            with connection:
+                request = json.loads(connection.makefile().readline())
+                if "status" in request:
+                    reply = {"returncode": _exit_codes.get(request["status"])}
+                    connection.sendall(json.dumps(reply).encode() + b"\n")
+                    continue
+                pid = os.fork()
+                if pid == 0:
+                    _child(connection, listener, request)
+                logger.info(f"Forked {request['script']} as PID {pid}")
+                connection.sendall(json.dumps({"pid": pid}).encode() + b"\n")
+    finally:
+        listener.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _request(request, socket_path, timeout):
+    """Send one request to the zygote and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        return json.loads(connection.makefile().readline())
+
+
+class ZygoteProcess:
+    """Popen-like handle for a game forked by the zygote.
+
+    The zygote is the game's parent and reaps it, so the exit code is
+    asked from the zygote once the game is gone. When it cannot say
+    (the zygote has exited too), returncode is UNKNOWN_EXIT.
+    """
+
+    UNKNOWN_EXIT = -1
+
+    def __init__(self, pid, socket_path=SOCKET_PATH):
+        self.pid = pid
+        self.socket_path = socket_path
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, 0)
+            except OSError as e:
+                if e.errno == errno.ESRCH:
+                    self.returncode = self._exit_code()
+        return self.returncode
+
+    def _exit_code(self):
+        try:
+            code = _request({"status": self.pid}, self.socket_path, timeout=1.0).get("returncode")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not get exit code of zygote child {self.pid}: {e}")
+            code = None
+        return self.UNKNOWN_EXIT if code is None else code
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(f"zygote child {self.pid}", timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, signum):
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+def spawn(script, args=(), env=None, socket_path=SOCKET_PATH, timeout=2.0):
+    """Ask the zygote to start script. Returns a ZygoteProcess or None."""
+    request = {"script": os.path.abspath(script), "args": list(args),
+               "cwd": os.getcwd(), "env": env or {}}
+    try:
+        reply = _request(request, socket_path, timeout)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Game zygote unavailable: {e}")
+        return None
+    return ZygoteProcess(reply["pid"], socket_path)
+
+
+def start(wait=0.0, socket_path=SOCKET_PATH):
+    """Launch the zygote process.
+
+    The socket only appears once preloading is done, and spawn() returns
+    None until then, so callers need not wait; with wait, block up to that
+    many seconds for it. Returns the Popen handle.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # left behind by a zygote that was killed
+    python_cmd = sys.executable if sys.executable else "python3"
+    process = subprocess.Popen([python_cmd, os.path.abspath(__file__), "--serve", socket_path])
+    logger.info(f"Game zygote starting with PID {process.pid}")
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline and process.poll() is None and not os.path.exists(socket_path):
+        time.sleep(0.1)
+    return process
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Run through the importable module so games that import game_zygote
+    # share its preloaded models
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import game_zygote
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        game_zygote.serve(sys.argv[2] if len(sys.argv) > 2 else SOCKET_PATH)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "--run":
+        game_zygote.run_game(sys.argv[2], sys.argv[3:])
+    else:
+        print("Usage: game_zygote.py --serve [socket] | --run script [args...]")
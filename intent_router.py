@@ -0,0 +1,99 @@
+import re
+from collections import namedtuple
+
+# Result of routing an utterance: the winning intent and its slot values
+IntentMatch = namedtuple("IntentMatch", ["name", "priority", "slots"])
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    """Split an utterance into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordSlot:
+    """Slot filled by the best-ranked keyword or phrase found in the tokens.
+
+    values maps each keyword (one or more words) to the slot value it
+    stands for. When several keywords are present, the one listed first
+    wins, so the table order decides ties.
+    """
+
+    def __init__(self, values):
+        self._by_first_token = {}
+        for rank, (keyword, value) in enumerate(values.items()):
+            words = tuple(tokenize(keyword))
+            if words:
+                self._by_first_token.setdefault(words[0], []).append((rank, words, value))
+
+    def extract(self, tokens):
+        best = None
+        for index, token in enumerate(tokens):
+            for rank, words, value in self._by_first_token.get(token, ()):
+                if tuple(tokens[index:index + len(words)]) == words and (best is None or rank < best[0]):
+                    best = (rank, value)
+        return best[1] if best else None
+
+
+class IntentRouter:
+    """Token-indexed dispatcher over a declarative intent table.
+
+    Each intent is a dict with a "name", a "priority" (higher wins) and
+    "patterns": lists of tokens that must all appear in the utterance. An
+    intent may also list required "slots" (filled by the extractors passed
+    in) and a "context" that has to be active for it to be considered.
+
+    The table is compiled once into an index from token to the patterns
+    that use it, so routing touches only the patterns sharing a token with
+    the utterance. Ties in priority go to the intent listed first.
+    """
+
+    def __init__(self, intents, slot_extractors=None):
+        self.intents = list(intents)
+        self.slot_extractors = slot_extractors or {}
+        self._index = {}
+        self._sizes = []
+        for intent_id, intent in enumerate(self.intents):
+            for pattern in intent["patterns"]:
+                pattern_id = len(self._sizes)
+                words = set(tokenize(" ".join(pattern)))
+                self._sizes.append((intent_id, len(words)))
+                for word in words:
+                    self._index.setdefault(word, []).append(pattern_id)
+        self._order = sorted(range(len(self.intents)),
+                             key=lambda intent_id: (-self.intents[intent_id]["priority"], intent_id))
+
+    def matches(self, text, contexts=()):
+        """Return every intent the utterance satisfies, best first."""
+        tokens = tokenize(text)
+        hits = {}
+        for token in set(tokens):
+            for pattern_id in self._index.get(token, ()):
+                hits[pattern_id] = hits.get(pattern_id, 0) + 1
+
+        matched = set()
+        for pattern_id, count in hits.items():
+            intent_id, size = self._sizes[pattern_id]
+            if count == size:
+                matched.add(intent_id)
+
+        results = []
+        for intent_id in self._order:
+            if intent_id not in matched:
+                continue
+            intent = self.intents[intent_id]
+            if intent.get("context") and intent["context"] not in contexts:
+                continue
+            slots = {}
+            for slot in intent.get("slots", ()):
+                slots[slot] = self.slot_extractors[slot].extract(tokens)
+            if any(value is None for value in slots.values()):
+                continue
+            results.append(IntentMatch(intent["name"], intent["priority"], slots))
+        return results
+
+    def route(self, text, contexts=()):
+        """Return the winning IntentMatch for an utterance, or None."""
+        results = self.matches(text, contexts)
+        return results[0] if results else None
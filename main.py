@@ -12,11 +12,33 @@ import logging
 import re
 import threading
 import signal
-from google.cloud import vision
+import urllib.parse
 import RPi.GPIO as GPIO
+import audio_cache
+import sound_bank
+import camera_service
+import frame_bus
+import vision_client
+import ocr_preprocess
+import ocr_cache
+import ocr_backends
+import topic_scoring
+import math_parser
+import intent_router
+import command_queue
+import speech_backends
+import wake_word
+import vad
+import mic_calibration
+import game_zygote
+import game_runtime
+import browser_session
+import asset_server
+import audio_player
+from topic_config import TOPIC_CONFIG, TOPIC_MATCHER
 
-# Initialize pygame mixer for audio playbook
-pygame.mixer.init()
+# Initialize pygame mixer for audio playbook (in the PCM cache's format)
+audio_cache.init_mixer()
 
 # Set Google Cloud credentials
 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'keytoken.json'
@@ -25,10 +47,31 @@ os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'keytoken.json'
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Topic waiting for the child to confirm after a low-confidence scan
+pending_topic = None
+pending_problem = None
+pending_topic_time = 0
+PENDING_TOPIC_TIMEOUT = 20  # seconds
+
 # Track active subprocess for Python scripts and browser processes
 active_subprocess = None
 active_browser_processes = []
 active_servo_process = None  # Track servo process
+frame_producer = None  # Process publishing camera frames on the frame bus
+zygote_process = None  # Preloaded process that forks the Python games, started on demand
+game_host_process = None  # Process running the camera games in-process
+active_game = None  # Game the game host is running for us
+browser_page_open = False  # Warm browser is showing a game
+
+# Predictive launch: the likely game is loaded hidden while the child is
+# still speaking or confirming the topic, and launch_file only has to show
+# it. A prepared game that is not launched is dropped after PRELAUNCH_TIMEOUT.
+PRELAUNCH = True
+PRELAUNCH_TIMEOUT = 30  # seconds
+prepared_topic = None
+prepared_time = 0
+prelaunch_lock = threading.Lock()
+prelaunch_stats = {"prepared": 0, "used": 0, "discarded": 0}
 
 # Audio files for greetings
 GREETING_AUDIO = [
@@ -46,68 +89,91 @@ HELP_AUDIO = [
 # Servo configuration
 SERVO_SCRIPT = "servo.py"  # Path to servo.py file
 
-# Topic-specific audio files and file mappings
-TOPIC_CONFIG = {
-    "addition": {
-        "file": "web-games/addition.html",
-        "audio": "audio_files/addition.wav",
-        "keywords": ["addition", "add", "plus", "+", "sum", "adding", "added"]
-    },
-    "subtraction": {
-        "file": "web-games/subtraction.html", 
-        "audio": "audio_files/subtraction.wav",
-        "keywords": ["subtraction", "subtract", "minus", "-", "difference", "subtracting", "subtracted"]
-    },
-    "multiplication": {
-        "file": "web-games/multiplication.html",
-        "audio": "audio_files/multiplication.wav", 
-        "keywords": ["multiplication", "multiply", "times", "Ã—", "*", "product", "multiplying", "multiplied"]
-    },
-    "division": {
-        "file": "web-games/division.html",
-        "audio": "audio_files/division.wav",
-        "keywords": ["division", "divide", "Ã·", "/", "quotient", "dividing", "divided"]
-    },
-    "colours": {
-        "file": "py_games/colors.py",
-        "audio": "audio_files/Colors.wav",
-        "keywords": ["color", "colour", "colors", "colours", "red", "blue", "green", "yellow"]
-    },
-    "shapes": {
-        "file": "web-games/shapes.html",
-        "audio": "audio_files/shapes.wav",
-        "keywords": ["shape", "shapes", "circle", "square", "triangle", "rectangle", "geometry"]
-    },
-    "face": {
-        "file": "face_parts_quiz.py", 
-        "audio": "audio_files/face_detection.wav",
-        "keywords": ["face", "facial", "features", "eyes", "nose", "mouth", "ears", "cheeks", "chin", "forehead", "skin", "face anatomy", "face detection", "facial recognition", "biology", "body", "human anatomy"]
-    },
-    "parts": {
-        "file": "py_games/face_parts_quiz.py", 
-        "audio": "audio_files/face_detection.wav",
-        "keywords": ["face", "facial", "features", "eyes", "nose", "mouth", "ears", "cheeks", "chin", "forehead", "skin", "face anatomy", "face detection", "facial recognition", "biology", "body", "human anatomy"]
-    },
-    "finger": {
-        "file": "py_games/finger_count.py", 
-        "audio": "audio_files/finger_detection.wav",
-        "keywords": ["finger", "fingers", "hand", "count", "digits", "thumb", "index", "middle", "ring", "little", "hand anatomy", "digit count", "biomechanics", "body", "biology"]
-    },
-    "counting": {
-        "file": "py_games/finger_count.py", 
-        "audio": "audio_files/finger_detection.wav",
-        "keywords": ["finger", "fingers", "hand", "count", "digits", "thumb", "index", "middle", "ring", "little", "hand anatomy", "digit count", "biomechanics", "body", "biology"]
-    },
-    "color": {
-        "file": "py_games/colors.py", 
-        "audio": "audio_files/Colors.wav",
-        "keywords": ["color", "colors", "hue", "spectrum", "red", "blue", "green", "yellow", "pigment", "palette", "tone", "shade", "saturation", "light", "dark"]
-    },
-    "colors": {
-        "file": "py_games/colors.py", 
-        "audio": "audio_files/Colors.wav",
-        "keywords": ["color", "colors", "hue", "palette", "spectrum", "paint", "shades", "mix", "vibrancy", "primary", "secondary", "tonal", "vibrancy"]
-    }
+# The homework preview stays up at least this long before the shot
+MIN_AIM_SECONDS = 2
+
+# OCR engine: "google", "tesseract" (offline) or "race" to run both and
+# take whichever first gives text a topic can be found in
+OCR_BACKEND = "race"
+
+# Voice commands. Each pattern is a list of words that must all be spoken;
+# the highest priority intent that matches wins, so "can you scan my
+# homework" goes to homework rather than help.
+INTENTS = [
+    {"name": "confirm_yes", "priority": 100, "context": "pending_topic",
+     "patterns": [["yes"], ["yeah"], ["yep"], ["sure"], ["ok"], ["okay"]]},
+    {"name": "confirm_no", "priority": 100, "context": "pending_topic",
+     "patterns": [["no"], ["nope"]]},
+    {"name": "hungry", "priority": 90,
+     "patterns": [["hungry"]]},
+    {"name": "close", "priority": 80,
+     "patterns": [["close"], ["stop", "game"], ["thank", "you"], ["thanks"],
+                  ["finish"], ["done"], ["exit"]]},
+    {"name": "topic_request", "priority": 70, "slots": ["topic"],
+     "patterns": [["teach", "me"], ["learn"], ["start"], ["play"]]},
+    {"name": "homework", "priority": 60,
+     "patterns": [["homework"], ["exercise"], ["problem"], ["question"], ["solve"],
+                  ["assignment"], ["worksheet"]]},
+    {"name": "greeting", "priority": 50,
+     "patterns": [["hello"], ["hi"], ["hey"]]},
+    {"name": "help", "priority": 40,
+     "patterns": [["can"], ["help"], ["assist"]]},
+]
+
+def topic_keywords():
+    """Map each spoken topic keyword to the first topic that lists it.
+    
+    Topic names come first, so "let's play counting" finds the counting
+    game even though only "count" is one of its keywords.
+    """
+    keywords = {topic.lower(): topic for topic in TOPIC_CONFIG}
+    for topic, config in TOPIC_CONFIG.items():
+        for keyword in config["keywords"]:
+            keywords.setdefault(keyword.lower(), topic)
+    return keywords
+
+INTENT_ROUTER = intent_router.IntentRouter(
+    INTENTS, {"topic": intent_router.KeywordSlot(topic_keywords())})
+
+# Speech recognition: "local" streams the microphone through the on-device
+# engine, decoding against the command phrases only, and acts on short
+# commands before the phrase ends; "google" is cloud only. Phrases the
+# command grammar cannot fit escalate through SPEECH_ESCALATION.
+SPEECH_BACKEND = "local"
+SPEECH_ESCALATION = ("local", "google")
+EARLY_INTENTS = {"greeting", "close", "hungry"}
+
+# Intent already acted on from a partial hypothesis of the current utterance
+early_intent = None
+
+# Only listen for commands after "Hey Homi" (needs the local speech model)
+WAKE_WORD = True
+wake_gate = None
+
+# Voice activity detector that ends phrases and trims their silence
+endpointer = None
+
+# Microphone in use, as named in the calibration store
+microphone_name = "default"
+FIRST_CALIBRATION_SECONDS = 3
+# A stored noise floor is checked against a short live reading first; a
+# room this much louder than stored would make every frame look like speech
+NOISE_CHECK_SECONDS = 0.5
+NOISE_CHECK_RATIO = 2.0
+# How often the refined noise floor is written back, in seconds
+CALIBRATION_SAVE_INTERVAL = 300
+
+# How often recognition and command queue metrics are logged, in seconds
+STATS_INTERVAL = 3600
+
+# Commands run on a worker pool so the microphone keeps listening. Speech
+# recognition may overlap; each other intent runs one at a time, and a new
+# command cancels older ones of the same kind plus those listed here.
+COMMAND_LIMITS = {"recognize": 2}
+COMMAND_SUPERSEDES = {
+    "close": ["homework", "topic_request", "confirm_yes", "greeting", "help", "prepare"],
+    "homework": ["topic_request"],
+    "topic_request": ["homework"],
 }
 
 # Other audio files
@@ -123,9 +189,17 @@ AUDIO_FILES = {
     "ready": "audio_files/ready.wav",
     "error": "audio_files/error.mp3",
     "camera_error": "audio_files/camera_error.wav",
+    "confirm_topic": "audio_files/confirm_topic.wav",
+    "listening": "audio_files/listening.wav",  # Optional wake word chime
     "servo_moving": "audio_files/servo_moving.wav"  # Optional servo sound
 }
 
+def all_audio_files():
+    """List every audio file referenced by the assistant."""
+    files = list(GREETING_AUDIO) + list(HELP_AUDIO) + list(AUDIO_FILES.values())
+    files += [config["audio"] for config in TOPIC_CONFIG.values()]
+    return files
+
 def run_servo_script():
     """Run the servo.py script once."""
     global active_servo_process
@@ -145,7 +219,7 @@ def run_servo_script():
             logger.info(f"Started servo script: {SERVO_SCRIPT} with PID {active_servo_process.pid}")
             
             # Optional: Play servo moving sound
-            play_audio(AUDIO_FILES.get("servo_moving", ""))
+            audio_player.play_effect(AUDIO_FILES.get("servo_moving", ""))
             
             # Wait a bit for servo to complete its action, then clean up
             time.sleep(3)  # Adjust based on your servo.py execution time
@@ -193,24 +267,17 @@ def show_fullscreen_hello():
     thread = threading.Thread(target=create_window, daemon=True)
     thread.start()
 
-def play_audio(file_path):
-    """Play an audio file using pygame."""
-    try:
-        if os.path.exists(file_path):
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.play()
-            
-            # Wait for the audio to finish playing
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            
-            logger.info(f"Played audio: {file_path}")
-        else:
-            logger.warning(f"Audio file not found: {file_path}")
-            print(f"Missing audio: {os.path.basename(file_path)}")
-    except Exception as e:
-        logger.error(f"Error playing audio {file_path}: {e}")
-        print(f"Audio error: {os.path.basename(file_path)}")
+def play_audio(file_path, wait=True, priority=audio_player.PRIORITY_NORMAL, interrupt=False):
+    """Queue an audio file for playback.
+    
+    Blocks until the clip has finished unless wait is False; the returned
+    future can be waited on later when ordering matters. With interrupt,
+    less important prompts that are playing or queued are cut off.
+    """
+    handle = audio_player.play(file_path, priority=priority, interrupt=interrupt)
+    if wait:
+        handle.result()
+    return handle
 
 def capture_image_with_camera(output_path='captured_homework.jpg', preview_delay=5000):
     """Captures an image using Raspberry Pi camera with preview window and delay."""
@@ -238,95 +305,251 @@ def capture_image_with_camera(output_path='captured_homework.jpg', preview_delay
         logger.error("rpicam-still command not found. Make sure camera tools are installed.")
         return None
 
-def detect_text_from_file(image_file):
-    """Detects text from a local image file using Google Vision API."""
+def detect_text(content):
+    """Detects text in encoded image bytes using the configured OCR backend."""
     try:
-        client = vision.ImageAnnotatorClient()
-
-        with io.open(image_file, 'rb') as file:
-            content = file.read()
+        full_text = ocr_backends.detect_text(
+            content, backend=OCR_BACKEND,
+            is_usable=lambda text: classify_topic_from_text(text.lower()) is not None)
 
-        image = vision.Image(content=content)
-        response = client.text_detection(image=image)
-        texts = response.text_annotations
-
-        if response.error.message:
-            logger.error(f'Google Vision API error: {response.error.message}')
-            return None
-
-        if texts:
-            full_text = texts[0].description
+        if full_text:
             logger.info(f"OCR Text extracted: {full_text[:100]}...")  # Log first 100 chars
             return full_text.lower()
         else:
-            logger.info("No text detected by Google Vision API")
+            logger.info("No text detected by OCR")
             return None
             
     except Exception as e:
-        logger.error(f"Google Vision OCR error: {e}")
+        logger.error(f"OCR error: {e}")
         return None
 
+def detect_text_from_file(image_file):
+    """Detects text from a local image file using the configured OCR backend."""
+    try:
+        with io.open(image_file, 'rb') as file:
+            content = file.read()
+    except Exception as e:
+        logger.error(f"Error reading image {image_file}: {e}")
+        return None
+    return detect_text(content)
+
+def capture_homework_image(prompt):
+    """Grab the homework photo as JPEG bytes once the prompt has finished.
+    
+    Uses the always-on camera service when it is running and falls back to
+    a one-off rpicam-still capture otherwise.
+    """
+    # Take the camera back from a game that ended on its own (a win, ESC),
+    # or that the game host had not yet released when "close" restarted
+    # the service; the prompt gives the host time to let go of it
+    if not camera_service.is_running():
+        prompt.result()
+        camera_service.start()
+    if camera_service.is_running():
+        # The sensor is already streaming, so the shot can be taken as soon
+        # as the child has heard the prompt; until then the preview shows
+        # the sheet so it can be aimed
+        camera_service.start_preview()
+        try:
+            aim_until = time.monotonic() + MIN_AIM_SECONDS
+            prompt.result()
+            time.sleep(max(0.0, aim_until - time.monotonic()))
+            return camera_service.grab_still()
+        finally:
+            camera_service.stop_preview()
+    
+    captured_image = capture_image_with_camera()
+    if not captured_image or not os.path.exists(captured_image):
+        return None
+    with io.open(captured_image, 'rb') as file:
+        return file.read()
+
 def capture_and_process_image():
-    """Capture image from camera and perform OCR using Google Vision API."""
+    """Capture image from camera, perform OCR and classify the topic.
+    
+    Returns (text, topic, confidence), with text None when nothing was read.
+    """
     try:
-        # Play audio notification
-        play_audio(AUDIO_FILES.get("taking_photo", ""))
+        # Play audio notification while the camera gets ready
+        prompt = play_audio(AUDIO_FILES.get("taking_photo", ""), wait=False)
         
         # Capture image with Pi camera
-        captured_image = capture_image_with_camera()
+        content = capture_homework_image(prompt)
         
-        if not captured_image or not os.path.exists(captured_image):
+        if not content:
             logger.error("Failed to capture image")
             play_audio(AUDIO_FILES.get("camera_error", ""))
-            return None
+            return None, None, 0.0
             
-        # Play processing audio
-        play_audio(AUDIO_FILES.get("ocr_processing", ""))
+        # Crop and shrink the photo so the upload is small
+        content = ocr_preprocess.prepare(content)
+        
+        # The same worksheet shown again doesn't need another API call,
+        # nor classifying again
+        image_hash = ocr_cache.image_hash(content)
+        cached = ocr_cache.lookup(image_hash)
+        if cached and (cached["topic"] is None or cached["topic"] in TOPIC_CONFIG):
+            return cached["text"], cached["topic"], cached["confidence"]
         
-        # Perform OCR using Google Vision API
-        text = detect_text_from_file(captured_image)
+        # Play processing audio while the OCR request is in flight
+        processing_prompt = play_audio(AUDIO_FILES.get("ocr_processing", ""), wait=False)
         
-        return text
+        # Perform OCR (cloud, local or both racing)
+        text = detect_text(content)
+        topic, confidence = None, 0.0
+        if text:
+            topic, confidence = classify_topic_with_confidence(text)
+            ocr_cache.store(image_hash, text, topic, confidence)
+        
+        # Don't talk over the processing prompt with the result
+        processing_prompt.result()
+        return text, topic, confidence
         
     except Exception as e:
         logger.error(f"OCR processing error: {e}")
         play_audio(AUDIO_FILES.get("error", ""))
-        return None
+        return None, None, 0.0
+
+def rank_topics_from_text(text):
+    """Rank every topic for OCR text as a list of (topic, confidence), best first."""
+    ranked = topic_scoring.rank_topics(text.lower(), TOPIC_CONFIG, TOPIC_MATCHER) if text else []
+    if ranked:
+        logger.info("Topic ranking: " + ", ".join(f"{topic} {confidence:.2f}"
+                                                  for topic, confidence in ranked[:3]))
+    return ranked
+
+def classify_topic_with_confidence(text):
+    """Return (topic, confidence) for OCR text, or (None, 0.0) if nothing fits."""
+    ranked = rank_topics_from_text(text)
+    if ranked and ranked[0][1] >= topic_scoring.MIN_CONFIDENCE:
+        return ranked[0]
+    logger.info("No topic identified from OCR text")
+    return None, 0.0
 
 def classify_topic_from_text(text):
-    """Classify topic based on OCR text using keywords."""
-    if not text:
-        return None
-        
-    text_words = text.lower().split()
+    """Classify topic based on weighted keyword, expression and layout evidence."""
+    topic, _ = classify_topic_with_confidence(text)
+    return topic
+
+def game_url(filename, problem=None):
+    """Build the browser URL for an HTML game.
     
-    # Check each topic's keywords
-    for topic, config in TOPIC_CONFIG.items():
-        for keyword in config["keywords"]:
-            if keyword in text or any(keyword in word for word in text_words):
-                logger.info(f"Topic '{topic}' identified from keyword: {keyword}")
-                return topic
-    
-    # Enhanced pattern matching for math operations
-    math_patterns = {
-        "addition": [r'\+', r'add', r'sum', r'plus', r'\d+\s*\+\s*\d+'],
-        "subtraction": [r'-', r'subtract', r'minus', r'difference', r'\d+\s*-\s*\d+'], 
-        "multiplication": [r'\*', r'Ã—', r'multiply', r'times', r'product', r'\d+\s*[Ã—*]\s*\d+'],
-        "division": [r'Ã·', r'/', r'divide', r'quotient', r'\d+\s*[Ã·/]\s*\d+']
-    }
-    
-    for topic, patterns in math_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text):
-                logger.info(f"Topic '{topic}' identified from pattern: {pattern}")
-                return topic
+    When the homework scan found a problem with both operands, they are
+    passed as ?a=..&b=.. so the game starts on the child's own problem.
+    Games come from the local asset server, so the browser can cache
+    them; file:// is used if the server is not running.
+    """
+    query = None
+    if problem is not None and problem.left is not None and problem.right is not None:
+        query = {"a": problem.left, "b": problem.right}
+    url = asset_server.url(filename, query)
+    if url is None:
+        url = f"file://{os.path.abspath(filename)}"
+        if query:
+            url += "?" + urllib.parse.urlencode(query)
+    return url
+
+def game_on_screen():
+    """Whether a game we launched is still showing.
     
-    logger.info("No topic identified from OCR text")
-    return None
+    Games can end without "close" (ESC or q, a win, a script exiting), so
+    the game host and the subprocess are asked, and a game that has ended
+    is forgotten.
+    """
+    global active_game, active_subprocess
+    if active_game is not None:
+        reply = game_runtime.send("status")
+        if not reply or reply.get("game") is None:
+            logger.info(f"Game {active_game} has ended")
+            active_game = None
+    if active_subprocess is not None and active_subprocess.poll() is not None:
+        logger.info(f"Game process {active_subprocess.pid} exited with {active_subprocess.returncode}")
+        active_subprocess = None
+    return active_game is not None or browser_page_open or active_subprocess is not None
+
+def prepare_topic(topic, problem=None):
+    """Load a topic's game hidden, so launching it later is quick."""
+    global prepared_topic, prepared_time
+    if not PRELAUNCH or topic not in TOPIC_CONFIG:
+        return
+    with prelaunch_lock:
+        if topic == prepared_topic:
+            prepared_time = time.time()
+            return
+        if game_on_screen():
+            return  # never disturb a game that is on screen
+        _discard_prepared()
+        config = TOPIC_CONFIG[topic]
+        if config.get("game"):
+            reply = game_runtime.send("prepare", config["game"])
+            ok = bool(reply and reply.get("ok"))
+        elif config["file"].endswith(".html"):
+            ok = browser_session.prepare_page(game_url(config["file"], problem))
+        else:
+            ok = False
+        if ok:
+            prepared_topic = topic
+            prepared_time = time.time()
+            prelaunch_stats["prepared"] += 1
+            logger.info(f"Preparing {topic} in the background")
+
+def _discard_prepared():
+    global prepared_topic
+    if prepared_topic is None:
+        return
+    if TOPIC_CONFIG[prepared_topic].get("game"):
+        game_runtime.send("discard")
+    else:
+        browser_session.discard_page()
+    logger.info(f"Discarded prepared {prepared_topic}")
+    prelaunch_stats["discarded"] += 1
+    prepared_topic = None
 
-def launch_file(filename, topic):
+def discard_prepared(max_age=None):
+    """Drop the prepared game, or only if it is older than max_age seconds."""
+    with prelaunch_lock:
+        if max_age is None or time.time() - prepared_time > max_age:
+            _discard_prepared()
+
+def zygote_running():
+    return zygote_process is not None and zygote_process.poll() is None
+
+def start_zygote():
+    """Start the zygote for the next game that has to run outside the game host.
+    
+    Every camera game runs in the game host, so the zygote is not started
+    at boot; it would keep a second copy of OpenCV and MediaPipe resident
+    for a path that is rarely used.
+    """
+    global zygote_process
+    if not zygote_running():
+        zygote_process = game_zygote.start()
+
+def launch_file(filename, topic, problem=None):
     """Launch a Python or HTML file."""
-    global active_subprocess, active_browser_processes
+    global active_subprocess, active_browser_processes, active_game, browser_page_open
+    global prepared_topic
+    with prelaunch_lock:
+        if prepared_topic == topic:
+            # The game host or warm browser shows the prepared game
+            logger.info(f"Launching prepared {topic}")
+            prelaunch_stats["used"] += 1
+            prepared_topic = None
+        else:
+            _discard_prepared()
+    game = TOPIC_CONFIG.get(topic, {}).get("game")
+    if game:
+        # Camera games run in the game host, which keeps the camera and
+        # models loaded between games
+        if not camera_service.uses_frame_bus():
+            camera_service.stop()
+        reply = game_runtime.send("play", game)
+        if reply and reply.get("ok"):
+            active_game = game
+            logger.info(f"Game host playing {game}")
+            return
+        logger.warning(f"Game host could not play {game}, launching {filename}")
+    
     if not filename:
         logger.info(f"No file specified for {topic}")
         play_audio(AUDIO_FILES.get("no_session", ""))
@@ -334,31 +557,44 @@ def launch_file(filename, topic):
     
     try:
         if filename.endswith(".py"):
-            # Launch Python script
-            python_cmd = sys.executable if sys.executable else "python3"
-            active_subprocess = subprocess.Popen([python_cmd, filename])
+            # Without the frame bus, vision games open the camera themselves
+            if not camera_service.uses_frame_bus():
+                camera_service.stop()
+            
+            # Fork the game from the preloaded zygote; start a fresh
+            # interpreter only if the zygote is not ready
+            active_subprocess = game_zygote.spawn(filename) if zygote_running() else None
+            if active_subprocess is None:
+                python_cmd = sys.executable if sys.executable else "python3"
+                active_subprocess = subprocess.Popen([python_cmd, filename])
+                start_zygote()
             logger.info(f"Launched {filename} with PID {active_subprocess.pid}")
         elif filename.endswith(".html"):
-            # Launch HTML file in browser
+            # Switch the warm browser to the game; start a new browser
+            # only if the warm one is not available
+            if browser_session.open_page(game_url(filename, problem)):
+                browser_page_open = True
+                logger.info(f"Opened {filename} in the warm browser")
+                return
             try:
                 process = subprocess.Popen([
                     "chromium-browser",
                     "--kiosk",                    # fullscreen kiosk mode
                     "--noerrdialogs",             # no error dialogs
                     "--disable-infobars",         # hide info bars
-                    "--incognito",                # optional: private mode (no cache)
                     "--start-fullscreen",         # ensure fullscreen on startup
-                    f"file://{os.path.abspath(filename)}"
+                    *browser_session.profile_args(browser_session.COLD_PROFILE_DIR),
+                    game_url(filename, problem)
                 ])
                 active_browser_processes.append(process)
                 logger.info(f"Opened {filename} in Chromium kiosk mode with PID {process.pid}")
             except FileNotFoundError:
                 try:
-                    process = subprocess.Popen(["firefox", f"file://{os.path.abspath(filename)}"])
+                    process = subprocess.Popen(["firefox", game_url(filename, problem)])
                     active_browser_processes.append(process)
                     logger.info(f"Opened {filename} in Firefox with PID {process.pid}")
                 except FileNotFoundError:
-                    webbrowser.open(f"file://{os.path.abspath(filename)}")
+                    webbrowser.open(game_url(filename, problem))
                     logger.info(f"Opened {filename} with default browser")
         else:
             logger.error(f"Unsupported file type: {filename}")
@@ -369,13 +605,22 @@ def launch_file(filename, topic):
 
 def close_all_active_files():
     """Close all active games and browser windows."""
-    global active_subprocess, active_browser_processes
+    global active_subprocess, active_browser_processes, active_game, browser_page_open
     logger.info("Closing all active files!")
-    play_audio(AUDIO_FILES.get("closing_game", ""))
+    play_audio(AUDIO_FILES.get("closing_game", ""), wait=False,
+               priority=audio_player.PRIORITY_URGENT, interrupt=True)
     
     # Run servo script when closing games
     run_servo_script()
     
+    discard_prepared()
+    
+    # Stop the game host's game, keeping the host itself warm
+    if active_game is not None:
+        game_runtime.send("stop")
+        logger.info(f"Stopped game {active_game}")
+        active_game = None
+    
     # Close Python script subprocess if running
     if active_subprocess is not None:
         try:
@@ -405,115 +650,235 @@ def close_all_active_files():
         except Exception as e:
             logger.error(f"Error closing browser process: {e}")
     
+    # Send the warm browser back to its idle page, keeping it running
+    if browser_page_open:
+        browser_session.show_idle()
+        browser_page_open = False
+    
     # Also try to kill chromium and firefox processes by name
     try:
-        subprocess.run(["pkill", "-f", "chromium"], check=False)
+        if not browser_session.is_running():
+            subprocess.run(["pkill", "-f", "chromium"], check=False)
         subprocess.run(["pkill", "-f", "firefox"], check=False)
         logger.info("Killed chromium and firefox processes")
     except Exception as e:
         logger.error(f"Error killing browser processes: {e}")
     
-    play_audio(AUDIO_FILES.get("thank_you", ""))
+    play_audio(AUDIO_FILES.get("thank_you", ""), wait=False)
+    
+    # Take the camera back from any game that was using it
+    camera_service.start()
 
 def close_game():
     """Legacy function - calls close_all_active_files"""
     close_all_active_files()
 
+def default_microphone():
+    """(index, name) of the system default input device, or (None, "default")."""
+    try:
+        audio = sr.Microphone.get_pyaudio().PyAudio()
+        try:
+            info = audio.get_default_input_device_info()
+            return info["index"], info["name"]
+        finally:
+            audio.terminate()
+    except Exception as e:
+        logger.warning(f"Could not read default microphone: {e}")
+        return None, "default"
+
+def probe_microphone(device_index, name, sample_rate=None):
+    """Raise unless device_index is still the named input device and can record."""
+    pyaudio = sr.Microphone.get_pyaudio()
+    audio = pyaudio.PyAudio()
+    try:
+        info = audio.get_device_info_by_index(device_index)
+        if info["name"] != name:
+            raise OSError(f"device {device_index} is now {info['name']}")
+        # Raises ValueError if the device cannot record in this format
+        audio.is_format_supported(sample_rate or int(info["defaultSampleRate"]),
+                                  input_device=device_index, input_channels=1,
+                                  input_format=pyaudio.paInt16)
+    finally:
+        audio.terminate()
+
 def setup_microphone():
-    """Set up microphone with Pi-specific settings."""
+    """Set up microphone with Pi-specific settings.
+    
+    The device chosen on an earlier run is reused without listing every
+    device; the list is only read again if that device cannot be opened.
+    """
+    global microphone_name
+    options = {}
+    if SPEECH_BACKEND == "local":
+        # The on-device model works at 16 kHz
+        options = {"sample_rate": speech_backends.STREAM_RATE, "chunk_size": speech_backends.STREAM_CHUNK}
+    
+    device = mic_calibration.cached_device()
+    if device is not None:
+        try:
+            # sr.Microphone only opens the device when used, so check it now
+            probe_microphone(device[0], device[1], options.get("sample_rate"))
+            microphone = sr.Microphone(device_index=device[0], **options)
+            microphone_name = device[1]
+            logger.info(f"Using cached microphone: {microphone_name}")
+            return microphone
+        except Exception as e:
+            logger.warning(f"Cached microphone {device[1]} unavailable: {e}")
+            mic_calibration.forget_device()
+    
     try:
         mic_list = sr.Microphone.list_microphone_names()
         logger.info(f"Available microphones: {mic_list}")
-        microphone = sr.Microphone(device_index=None)
+        device_index, microphone_name = default_microphone()
+        microphone = sr.Microphone(device_index=device_index, **options)
+        if device_index is not None:
+            mic_calibration.remember_device(device_index, microphone_name)
         return microphone
     except Exception as e:
         logger.error(f"Microphone setup error: {e}")
         return None
 
-def callback(recognizer, audio):
-    """Process voice commands."""
+def start_topic(topic, problem=None):
+    """Play a topic's intro and launch its game, optionally on a given problem."""
+    config = TOPIC_CONFIG[topic]
+    play_audio(config["audio"], wait=False)
+    launch_file(config["file"], topic, problem)
+
+def ask_to_confirm_topic(topic, problem=None):
+    """Ask the child whether a low-confidence topic is right."""
+    global pending_topic, pending_problem, pending_topic_time
+    pending_topic = topic
+    pending_problem = problem
+    pending_topic_time = time.time()
+    logger.info(f"Asking to confirm topic: {topic}")
+    # Until confirm_topic.wav is recorded the printed question is all there
+    # is; nothing is launched unless the answer is yes
+    print(f"Is this homework about {topic}? Say 'yes' or 'no'.")
+    if not os.path.exists(AUDIO_FILES["confirm_topic"]):
+        logger.warning(f"{AUDIO_FILES['confirm_topic']} not found - the question is only printed")
+    if wake_gate is not None:
+        # The answer should not need the wake word
+        wake_gate.open(PENDING_TOPIC_TIMEOUT)
+    play_audio(AUDIO_FILES.get("confirm_topic", ""), wait=False)
+    # Most answers are yes, so load the game while the child decides
+    prepare_topic(topic, problem)
+
+def handle_confirm_yes(text, slots):
+    global pending_topic
+    topic, pending_topic = pending_topic, None
+    logger.info(f"Topic confirmed: {topic}")
+    start_topic(topic, pending_problem)
+
+def handle_confirm_no(text, slots):
+    global pending_topic
+    pending_topic = None
+    discard_prepared()
+    play_audio(AUDIO_FILES.get("topic_not_found", ""), wait=False)
+
+def handle_hungry(text, slots):
+    logger.info("Hungry keyword detected - running servo script")
+    run_servo_script()
+
+def handle_close(text, slots):
+    close_all_active_files()
+
+def handle_greeting(text, slots):
+    audio_file = random.choice(GREETING_AUDIO)
+    logger.info(f"Playing greeting: {audio_file}")
+    play_audio(audio_file, wait=False)
+
+def handle_help(text, slots):
+    audio_file = random.choice(HELP_AUDIO)
+    logger.info(f"Playing help response: {audio_file}")
+    play_audio(audio_file, wait=False)
+
+def handle_topic_request(text, slots):
+    topic = slots["topic"]
+    logger.info(f"Direct topic request: {topic}")
+    start_topic(topic)
+
+def handle_homework(text, slots):
+    logger.info("Homework command detected - starting OCR process")
+    
+    # Capture and process image, classifying the topic from its text
+    ocr_text, identified_topic, confidence = capture_and_process_image()
+    if not ocr_text or command_queue.cancelled():
+        return
+    
+    # The child's own problem, so the game can start on it
+    problem = math_parser.first_problem(ocr_text, identified_topic) if identified_topic else None
+    if problem:
+        logger.info(f"Problem found: {problem.text}")
+    
+    if identified_topic and confidence >= topic_scoring.CONFIRM_CONFIDENCE:
+        logger.info(f"Topic identified: {identified_topic} ({confidence:.2f})")
+        play_audio(AUDIO_FILES.get("topic_found", ""), wait=False)
+        
+        # Play topic-specific starting audio and launch file
+        start_topic(identified_topic, problem)
+    elif identified_topic:
+        # Not sure enough to launch a game - check with the child first
+        ask_to_confirm_topic(identified_topic, problem)
+    else:
+        logger.info("No matching topic found in homework")
+        play_audio(AUDIO_FILES.get("topic_not_found", ""), wait=False)
+
+# Intent name -> handler(text, slots)
+INTENT_HANDLERS = {
+    "confirm_yes": handle_confirm_yes,
+    "confirm_no": handle_confirm_no,
+    "hungry": handle_hungry,
+    "close": handle_close,
+    "greeting": handle_greeting,
+    "help": handle_help,
+    "topic_request": handle_topic_request,
+    "homework": handle_homework,
+}
+
+def active_contexts():
+    """Conversation states that enable context-only intents."""
+    if pending_topic and time.time() - pending_topic_time < PENDING_TOPIC_TIMEOUT:
+        return ("pending_topic",)
+    return ()
+
+def command_phrases():
+    """Every phrase the command grammar accepts, built from the intent table."""
+    phrases = set(topic_keywords())
+    for intent in INTENTS:
+        for pattern in intent["patterns"]:
+            phrases.add(" ".join(pattern))
+            if "topic" in intent.get("slots", ()):
+                phrases.update(f"{' '.join(pattern)} {keyword}" for keyword in topic_keywords())
+    phrases.update(["i'm hungry", "close game", "close the game", "stop the game", "thank you",
+                    "help me with homework", "help me with my homework", "scan my homework"])
+    # Symbols such as "+" are keywords for OCR text, not for speech
+    return {phrase for phrase in phrases if re.search(r"[a-z]", phrase)}
+
+def dispatch_text(text):
+    """Route recognized text and queue its command. Returns the IntentMatch."""
+    logger.info(f"Voice command: {text}")
+    intent = INTENT_ROUTER.route(text, active_contexts())
+    if intent is None:
+        logger.info(f"No matching command for: {text}")
+        return None
+    logger.info(f"Intent: {intent.name} {intent.slots or ''}")
+    if wake_gate is not None:
+        wake_gate.extend()
+    command_queue.submit(intent.name, INTENT_HANDLERS[intent.name], text, intent.slots)
+    return intent
+
+def recognize_command(recognizer, audio, backends=None):
+    """Turn captured audio into text and queue the command it asks for."""
+    if backends is None:
+        backends = ("grammar",) + SPEECH_ESCALATION if SPEECH_BACKEND == "local" else (SPEECH_BACKEND,)
     try:
         # Convert audio to text
-        text = recognizer.recognize_google(audio, language="en-US").lower()
-        logger.info(f"Voice command: {text}")
-        
-        # Check for hungry keyword
-        hungry_keywords = ["hungry", "i'm hungry", "am hungry", "feeling hungry"]
-        if any(keyword in text for keyword in hungry_keywords):
-            logger.info("Hungry keyword detected - running servo script")
-            run_servo_script()
-            return
-        
-        # Check for close/thank you commands
-        close_patterns = [
-            ("close" in text and "game" in text),
-            ("stop" in text and "game" in text),
-            ("thank" in text and "you" in text),
-            ("thanks" in text),
-            ("close" in text),
-            ("finish" in text),
-            ("done" in text),
-            ("exit" in text)
-        ]
-        
-        if any(close_patterns):
-            close_all_active_files()
-            return
-        
-        # Check for greeting commands
-        if any(word in text.split() for word in ["hello", "hi", "hey"]):
-            audio_file = random.choice(GREETING_AUDIO)
-            logger.info(f"Playing greeting: {audio_file}")
-            play_audio(audio_file)
-            return
-        
-        # Check for help/can responses  
-        if any(word in text for word in ["can", "help", "assist"]):
-            audio_file = random.choice(HELP_AUDIO)
-            logger.info(f"Playing help response: {audio_file}")
-            play_audio(audio_file)
+        text = speech_backends.recognize(recognizer, audio, backends)
+        if not text:
+            logger.debug("Could not understand audio")
             return
+        dispatch_text(text)
         
-        # Check for direct topic learning commands
-        if any(phrase in text for phrase in ["teach me", "learn", "start", "play"]):
-            for topic, config in TOPIC_CONFIG.items():
-                if any(keyword in text for keyword in config["keywords"]):
-                    logger.info(f"Direct topic request: {topic}")
-                    play_audio(config["audio"])
-                    launch_file(config["file"], topic)
-                    return
-        
-        # Check for homework-related commands (triggers OCR)
-        homework_keywords = ["homework", "exercise", "problem", "question", "solve", "assignment", "worksheet"]
-        if any(keyword in text for keyword in homework_keywords):
-            logger.info("Homework command detected - starting OCR process")
-            
-            # Capture and process image
-            ocr_text = capture_and_process_image()
-            
-            if ocr_text:
-                # Classify topic from OCR text
-                identified_topic = classify_topic_from_text(ocr_text)
-                
-                if identified_topic:
-                    logger.info(f"Topic identified: {identified_topic}")
-                    play_audio(AUDIO_FILES.get("topic_found", ""))
-                    
-                    # Play topic-specific starting audio and launch file
-                    config = TOPIC_CONFIG[identified_topic]
-                    play_audio(config["audio"])
-                    launch_file(config["file"], identified_topic)
-                else:
-                    logger.info("No matching topic found in homework")
-                    play_audio(AUDIO_FILES.get("topic_not_found", ""))
-            return
-        
-        # If no specific command matched
-        logger.info(f"No matching command for: {text}")
-        
-    except sr.UnknownValueError:
-        logger.debug("Could not understand audio")
-        pass
     except sr.RequestError as e:
         logger.error(f"Speech recognition error: {e}")
         pass
@@ -521,8 +886,60 @@ def callback(recognizer, audio):
         logger.error(f"Callback error: {e}")
         pass
 
+def on_partial_speech(text):
+    """Act on a short command while the child is still talking."""
+    global early_intent
+    if early_intent is not None:
+        return
+    intent = INTENT_ROUTER.route(text, active_contexts())
+    if intent and intent.name in EARLY_INTENTS:
+        logger.info(f"Early command from partial: {text}")
+        early_intent = dispatch_text(text)
+    elif intent and intent.name == "topic_request" and intent.slots["topic"] != prepared_topic:
+        # Load the game while the child finishes the sentence
+        command_queue.submit("prepare", prepare_topic, intent.slots["topic"])
+
+def make_final_speech_handler(recognizer):
+    """Build the end-of-utterance handler for the streaming recognizer."""
+    def on_final_speech(text, audio):
+        global early_intent
+        acted, early_intent = early_intent, None
+        if text:
+            intent = INTENT_ROUTER.route(text, active_contexts())
+            if acted and intent and intent.name == acted.name:
+                return
+            if intent:
+                dispatch_text(text)
+                return
+        if SPEECH_ESCALATION and not acted and audio.frame_data:
+            # Not a command phrase - try open dictation
+            command_queue.submit("recognize", recognize_command, recognizer, audio, SPEECH_ESCALATION)
+    return on_final_speech
+
+def callback(recognizer, audio):
+    """Hand captured audio to the command workers.
+    
+    Runs on the listener thread, so it only queues work and returns at once.
+    """
+    command_queue.submit("recognize", recognize_command, recognizer, audio)
+
+def on_wake():
+    """Let the child know Homi is listening."""
+    audio_player.play_effect(AUDIO_FILES.get("listening", ""), duck_voice=False)
+
+def log_speech_stats():
+    """Log how much audio reached recognition, per hour."""
+    logger.info(f"Recognition calls per hour: {speech_backends.calls_per_hour()}")
+    if wake_gate is not None:
+        logger.info(f"Wake word gate: {wake_gate.stats()}")
+    if endpointer is not None:
+        logger.info(f"Voice activity: {endpointer.stats()}")
+    logger.info(f"Command queue stats: {command_queue.stats()}")
+    logger.info(f"Predictive launch: {prelaunch_stats}")
+
 def main():
     """Main function."""
+    global frame_producer, game_host_process, wake_gate, endpointer
     
     print("Initializing Homi - Smart Study Assistant with Google Vision OCR and Servo Control")
     
@@ -541,15 +958,36 @@ def main():
         print("Please ensure keytoken.json is in the same directory as this script.")
         return
     
-    # Test Google Vision API connectivity
+    # Transcode new or changed prompts once, then load them all up front
+    # so replies start immediately
+    audio_cache.compile_assets(all_audio_files())
+    sound_bank.preload(all_audio_files())
+    
+    # Create the Google Vision client now and connect it in the background,
+    # so the first homework scan is fast but boot does not need the network
     try:
-        client = vision.ImageAnnotatorClient()
+        vision_client.warm()
         logger.info("Google Vision API client initialized successfully")
         show_fullscreen_hello()
     except Exception as e:
         logger.error(f"Failed to initialize Google Vision API: {e}")
-        print("Please check your Google Cloud credentials and internet connection.")
-        return
+        print("Please check your Google Cloud credentials.")
+        if OCR_BACKEND == "google":
+            return
+        logger.warning("Continuing with local OCR only")
+        show_fullscreen_hello()
+    
+    # Share one streaming camera between homework photos and the games
+    frame_producer = frame_bus.start_producer()
+    camera_service.start()
+    
+    # Load OpenCV and MediaPipe once, in the background, for every game
+    game_host_process = game_runtime.start()
+    
+    # Serve the HTML games over http so the browser caches them, and keep
+    # a browser running in the background to show them
+    asset_server.start()
+    threading.Thread(target=browser_session.start, daemon=True).start()
     
     # Initialize recognizer and microphone
     recognizer = sr.Recognizer()
@@ -559,39 +997,94 @@ def main():
         print("Failed to set up microphone. Exiting.")
         return
     
-    # Configure recognizer for Pi
+    # Configure recognizer for Pi. Phrases are endpointed by vad, which
+    # adapts the closing pause to the phrase instead of a fixed threshold.
     recognizer.energy_threshold = 300
     recognizer.dynamic_energy_threshold = True
-    recognizer.pause_threshold = 0.8
     
-    # Adjust for ambient noise
+    # Restore the noise floor measured on an earlier run, or measure it now
+    noise_rms = mic_calibration.noise_floor(microphone_name)
     try:
-        with microphone as source:
-            print("Calibrating microphone... Please wait.")
-            recognizer.adjust_for_ambient_noise(source, duration=3)
-            print("Ready! Say 'Hello' to start, 'help me with homework' for OCR mode, 'I'm hungry' for servo, or 'close game' to end sessions.")
+        if noise_rms is not None:
+            with microphone as source:
+                live_rms = vad.measure_noise(source, NOISE_CHECK_SECONDS)
+            if live_rms > noise_rms * NOISE_CHECK_RATIO:
+                # The endpointer only lowers a floor that is too high, so
+                # one that is too low has to be fixed here
+                logger.info(f"Room louder than calibrated ({live_rms:.1f} vs {noise_rms:.1f})")
+                noise_rms = live_rms
+                mic_calibration.store_noise_floor(microphone_name, noise_rms)
+            recognizer.energy_threshold = noise_rms * recognizer.dynamic_energy_ratio
+            logger.info(f"Restored microphone calibration: noise floor {noise_rms:.1f}")
+        else:
+            with microphone as source:
+                print("Calibrating microphone... Please wait.")
+                recognizer.adjust_for_ambient_noise(source, duration=FIRST_CALIBRATION_SECONDS)
+            noise_rms = recognizer.energy_threshold / recognizer.dynamic_energy_ratio
+            mic_calibration.store_noise_floor(microphone_name, noise_rms)
+        print("Ready! Say 'Hey Homi', then 'Hello' to start, 'help me with homework' for OCR mode, 'I'm hungry' for servo, or 'close game' to end sessions.")
     except Exception as e:
         logger.error(f"Microphone calibration failed: {e}")
         play_audio(AUDIO_FILES.get("error", ""))
     
     # Start listening
+    command_queue.start(limits=COMMAND_LIMITS, supersedes=COMMAND_SUPERSEDES)
     try:
-        stop_listening = recognizer.listen_in_background(microphone, callback, phrase_time_limit=5)
+        stop_listening = None
+        if SPEECH_BACKEND == "local":
+            speech_backends.set_grammar(command_phrases())
+            if WAKE_WORD and speech_backends.local_available():
+                wake_gate = wake_word.WakeWordGate(speech_backends.get_model(),
+                                                   microphone.SAMPLE_RATE, on_wake)
+            endpointer = vad.Endpointer(microphone.SAMPLE_RATE, microphone.SAMPLE_WIDTH, noise_rms)
+            stop_listening = speech_backends.listen_streaming(
+                microphone, on_partial_speech, make_final_speech_handler(recognizer),
+                gate=wake_gate, endpointer=endpointer)
+            if stop_listening is None:
+                logger.warning("Local speech model not installed - using cloud recognition")
+        if stop_listening is None:
+            if WAKE_WORD:
+                logger.warning("Wake word needs the local speech model - listening to everything")
+            stop_listening, endpointer = vad.listen_in_background(microphone, recognizer, callback, noise_rms)
         play_audio(AUDIO_FILES.get("ready", ""))
         
         # Keep running
+        last_stats = last_calibration = time.monotonic()
         while True:
             time.sleep(0.1)
+            if endpointer is not None and time.monotonic() - last_calibration >= CALIBRATION_SAVE_INTERVAL:
+                # The endpointer keeps refining the noise floor from quiet frames
+                last_calibration = time.monotonic()
+                mic_calibration.store_noise_floor(microphone_name, endpointer.noise_rms)
+            if prepared_topic is not None:
+                discard_prepared(PRELAUNCH_TIMEOUT)
+            if time.monotonic() - last_stats >= STATS_INTERVAL:
+                last_stats = time.monotonic()
+                log_speech_stats()
             
             
     except KeyboardInterrupt:
         print("\nShutting down Homi...")
         stop_listening(wait_for_stop=False)
         logger.info("Stopped listening")
+        command_queue.stop()
+        log_speech_stats()
+        if endpointer is not None:
+            mic_calibration.store_noise_floor(microphone_name, endpointer.noise_rms)
         
         # Cleanup
         close_all_active_files()
         play_audio(AUDIO_FILES.get("goodbye", ""))
+        audio_player.stop()
+        camera_service.stop()
+        if frame_producer is not None:
+            frame_producer.terminate()
+        if zygote_process is not None:
+            zygote_process.terminate()
+        if game_host_process is not None:
+            game_host_process.terminate()
+        browser_session.stop()
+        asset_server.stop()
         
     except Exception as e:
         logger.error(f"Main loop error: {e}")
@@ -0,0 +1,82 @@
+import re
+from collections import namedtuple
+
+# One arithmetic problem read from a worksheet. Operands and result are
+# ints, or None where the sheet leaves a blank for the child to fill in.
+Problem = namedtuple("Problem", ["left", "operator", "right", "result", "text"])
+
+# Normalised operator -> topic it belongs to
+OPERATOR_TOPICS = {
+    "+": "addition",
+    "-": "subtraction",
+    "×": "multiplication",
+    "÷": "division",
+}
+
+# Characters OCR (or a UTF-8 file read as cp1252) turns the operators into
+_SYMBOL_FIXES = [
+    ("Ã—", "×"),
+    ("Ã·", "÷"),
+    ("−", "-"),  # minus sign
+    ("–", "-"),  # en dash
+    ("—", "-"),  # em dash
+    ("*", "×"),
+    ("/", "÷"),
+]
+# Letters that stand in for operators or digits only between numbers
+_TIMES_LETTER = re.compile(r"(?<=\d)\s*[xX]\s*(?=\d|_|\?)")
+_DIVIDE_COLON = re.compile(r"(?<=\d)\s*:\s*(?=\d|_|\?)")
+_DIGIT_O = re.compile(r"(?<=\d)[oO]|[oO](?=\d)")
+_DIGIT_L = re.compile(r"(?<=\d)[lI|]|[lI|](?=\d)")
+
+_OPERAND = r"(\d+|_+|\?|□)"
+PROBLEM_PATTERN = re.compile(
+    _OPERAND + r"(\s*)([+\-×÷])(\s*)" + _OPERAND + r"(?:\s*=\s*" + _OPERAND + r"?)?"
+)
+
+
+def normalize(text):
+    """Undo common OCR confusions so operators and digits are unambiguous."""
+    for wrong, right in _SYMBOL_FIXES:
+        text = text.replace(wrong, right)
+    text = _DIGIT_O.sub("0", text)
+    text = _DIGIT_L.sub("1", text)
+    text = _TIMES_LETTER.sub(" × ", text)
+    text = _DIVIDE_COLON.sub(" ÷ ", text)
+    return text
+
+
+def _value(token):
+    return int(token) if token and token.isdigit() else None
+
+
+def extract_problems(text):
+    """Return every arithmetic problem in OCR text as a list of Problem.
+
+    A match needs spacing around the operator or an "=" after it, so
+    dates like 12-03 and hyphenated words are not read as sums.
+    """
+    problems = []
+    for line in normalize(text).splitlines():
+        for match in PROBLEM_PATTERN.finditer(line):
+            left, space_before, operator, space_after, right, result = match.groups()
+            has_equals = "=" in match.group(0)
+            if not has_equals and not (space_before and space_after):
+                continue
+            if _value(left) is None and _value(right) is None:
+                continue
+            end = match.end()
+            if not has_equals and end < len(line) and line[end] in "+-×÷":
+                # Chains like 2024-03-12 are dates or codes, not problems
+                continue
+            problems.append(Problem(_value(left), operator, _value(right), _value(result),
+                                    match.group(0).strip()))
+    return problems
+
+
+def first_problem(text, topic=None):
+    """Return the first problem in text, optionally only one for topic."""
+    for problem in extract_problems(text):
+        if topic is None or OPERATOR_TOPICS[problem.operator] == topic:
+            return problem
+    return None
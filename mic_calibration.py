@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+STORE_FILE = ".mic_calibration.json"
+
+# Older measurements are not trusted; the room may have changed
+MAX_AGE = 30 * 24 * 60 * 60
+
+# Noise floors closer than this ratio to the stored one are not worth a write
+MIN_CHANGE = 0.1
+
+_data = None
+_lock = threading.Lock()
+
+
+def _load():
+    global _data
+    if _data is None:
+        try:
+            with open(STORE_FILE) as f:
+                _data = json.load(f)
+        except (OSError, ValueError):
+            _data = {}
+        _data.setdefault("profiles", {})
+    return _data
+
+
+def _save():
+    tmp_path = STORE_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(_data, f, indent=2)
+    os.replace(tmp_path, STORE_FILE)
+
+
+def cached_device():
+    """Return the (device index, device name) chosen last time, or None."""
+    with _lock:
+        device = _load().get("device")
+    if not device:
+        return None
+    return device["index"], device["name"]
+
+
+def remember_device(index, name):
+    with _lock:
+        _load()["device"] = {"index": index, "name": name}
+        _save()
+
+
+def forget_device():
+    with _lock:
+        if _load().pop("device", None) is not None:
+            _save()
+
+
+def _profile_key(device_name, room):
+    return f"{device_name}|{room}"
+
+
+def noise_floor(device_name, room="default"):
+    """Return the stored noise floor (RMS) for a device and room, or None."""
+    with _lock:
+        profile = _load()["profiles"].get(_profile_key(device_name, room))
+    if not profile or time.time() - profile["updated"] > MAX_AGE:
+        return None
+    return profile["noise_rms"]
+
+
+def store_noise_floor(device_name, noise_rms, room="default"):
+    """Persist a measured noise floor. Returns True if the store changed."""
+    key = _profile_key(device_name, room)
+    with _lock:
+        profiles = _load()["profiles"]
+        profile = profiles.get(key)
+        if profile and abs(noise_rms - profile["noise_rms"]) <= MIN_CHANGE * profile["noise_rms"] \
+                and time.time() - profile["updated"] < MAX_AGE / 2:
+            return False
+        profiles[key] = {"noise_rms": round(float(noise_rms), 1), "updated": time.time()}
+        try:
+            _save()
+        except OSError as e:
+            logger.error(f"Could not save microphone calibration: {e}")
+            return False
+    logger.info(f"Stored noise floor {noise_rms:.1f} for {device_name} ({room})")
+    return True
@@ -0,0 +1,100 @@
+import time
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+
+import vision_client
+
+logger = logging.getLogger(__name__)
+
+# Local engine settings: page segmentation mode 6 treats the photo as one
+# block of text, which suits worksheets
+TESSERACT_CMD = "tesseract"
+TESSERACT_ARGS = ["--psm", "6", "-l", "eng"]
+TESSERACT_TIMEOUT = 20
+
+# How long a race waits for a usable answer before settling for what it has
+RACE_TIMEOUT = 10
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ocr")
+
+
+def google_ocr(content):
+    """Cloud OCR through the shared Google Vision client."""
+    text, _ = vision_client.detect_text(content)
+    return text
+
+
+def tesseract_ocr(content):
+    """Local OCR by piping the image through the tesseract command."""
+    try:
+        result = subprocess.run([TESSERACT_CMD, "stdin", "stdout"] + TESSERACT_ARGS,
+                                input=content, capture_output=True,
+                                timeout=TESSERACT_TIMEOUT, check=True)
+    except FileNotFoundError:
+        logger.error("tesseract command not found. Install it with: sudo apt install tesseract-ocr")
+        return None
+    text = result.stdout.decode("utf-8", errors="replace").strip()
+    return text or None
+
+
+# Every backend takes encoded image bytes and returns the text or None
+BACKENDS = {
+    "google": google_ocr,
+    "tesseract": tesseract_ocr,
+}
+
+
+def _run(name, content):
+    start = time.monotonic()
+    try:
+        text = BACKENDS[name](content)
+    except Exception as e:
+        logger.error(f"{name} OCR error: {e}")
+        text = None
+    logger.info(f"{name} OCR finished in {time.monotonic() - start:.2f}s "
+                f"({len(text) if text else 0} chars)")
+    return text
+
+
+def race(content, is_usable, backends=("tesseract", "google"), timeout=RACE_TIMEOUT):
+    """Run several backends at once and return the first usable answer.
+
+    is_usable(text) decides whether a result is good enough to stop
+    waiting (e.g. a topic can be classified from it). If no backend gives a
+    usable result within timeout seconds, the first non-empty text is
+    returned. Returns (text, backend name), with (None, None) when nothing
+    was read.
+    """
+    futures = {_executor.submit(_run, name, content): name for name in backends}
+    fallback = (None, None)
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            name = futures[future]
+            text = future.result()
+            if not text:
+                continue
+            if is_usable(text):
+                logger.info(f"OCR race won by {name}")
+                return text, name
+            if fallback[0] is None:
+                fallback = (text, name)
+    except TimeoutError:
+        # The slow backends keep running on the pool; their results are dropped
+        logger.warning(f"OCR race timed out after {timeout}s, using {fallback[1] or 'no result'}")
+    return fallback
+
+
+def detect_text(content, backend="google", is_usable=None):
+    """Read text from encoded image bytes with the chosen backend.
+
+    backend is a key of BACKENDS, or "race" to run every backend
+    concurrently and keep the first result is_usable accepts.
+    """
+    if backend == "race":
+        text, _ = race(content, is_usable or bool, tuple(BACKENDS))
+        return text
+    if backend not in BACKENDS:
+        logger.error(f"Unknown OCR backend: {backend}")
+        return None
+    return _run(backend, content)
@@ -0,0 +1,60 @@
+"""Compare raw uploads with pre-processed ones for Google Vision OCR.
+
+Usage: python ocr_benchmark.py photo1.jpg [photo2.jpg ...]
+
+For every photo, prints the payload size and Vision round trip for the
+raw JPEG and for the output of ocr_preprocess.prepare, plus whether the
+extracted text still matches.
+"""
+import os
+import io
+import sys
+import time
+import logging
+
+import ocr_preprocess
+import vision_client
+
+os.environ.setdefault('GOOGLE_APPLICATION_CREDENTIALS', 'keytoken.json')
+
+
+def round_trip(content):
+    start = time.monotonic()
+    text, timings = vision_client.detect_text(content)
+    return text or "", time.monotonic() - start
+
+
+def main(paths):
+    vision_client.warm(keepalive=False, wait=True)
+    totals = {"raw_bytes": 0, "prep_bytes": 0, "raw_time": 0.0, "prep_time": 0.0}
+    print(f"{'image':30} {'raw KB':>8} {'prep KB':>8} {'prep ms':>8} {'raw rtt':>8} {'prep rtt':>9}  same text")
+    for path in paths:
+        with io.open(path, 'rb') as file:
+            raw = file.read()
+        start = time.monotonic()
+        prepared = ocr_preprocess.prepare(raw)
+        prep_ms = (time.monotonic() - start) * 1000
+
+        raw_text, raw_time = round_trip(raw)
+        prep_text, prep_time = round_trip(prepared)
+        same = raw_text.split() == prep_text.split()
+
+        totals["raw_bytes"] += len(raw)
+        totals["prep_bytes"] += len(prepared)
+        totals["raw_time"] += raw_time
+        totals["prep_time"] += prep_time
+        print(f"{os.path.basename(path)[:30]:30} {len(raw) / 1024:8.0f} {len(prepared) / 1024:8.0f} "
+              f"{prep_ms:8.0f} {raw_time:7.2f}s {prep_time:8.2f}s  {'yes' if same else 'no'}")
+
+    if paths:
+        print(f"\nPayload: {totals['raw_bytes'] / 1024:.0f} KB -> {totals['prep_bytes'] / 1024:.0f} KB "
+              f"({100 * (1 - totals['prep_bytes'] / totals['raw_bytes']):.0f}% smaller)")
+        print(f"Round trip: {totals['raw_time'] / len(paths):.2f}s -> {totals['prep_time'] / len(paths):.2f}s per image")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1:])
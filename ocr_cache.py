@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import logging
+import threading
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = ".ocr_cache"
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+# A 16x16 grid of brightness differences: fine enough to tell apart
+# worksheets that share a layout but not the same sums
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+# Two photos whose hashes differ in at most this many bits (under 10%) are
+# treated as the same worksheet
+MAX_DISTANCE = HASH_BITS * 6 // 64
+TTL_SECONDS = 24 * 60 * 60
+MAX_ENTRIES = 200
+
+_entries = None
+_lock = threading.Lock()
+
+
+def image_hash(content):
+    """Return a HASH_BITS-bit difference hash of encoded image bytes, or None.
+
+    Small shifts, exposure changes and re-encoding only flip a few bits,
+    so near-identical shots of the same page land close together.
+    """
+    gray = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    small = cv2.resize(gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(INDEX_FILE) as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = []
+        # Hashes of another size can't be compared with ours, and older
+        # entries have no confidence to go with their topic
+        _entries = [entry for entry in _entries
+                    if entry.get("bits") == HASH_BITS and "confidence" in entry]
+    return _entries
+
+
+def _save():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(_entries, f)
+    os.replace(tmp_path, INDEX_FILE)
+
+
+def _expire(entries, now):
+    """Drop expired entries, then the least recently used beyond MAX_ENTRIES."""
+    entries[:] = [entry for entry in entries if now - entry["created"] < TTL_SECONDS]
+    if len(entries) > MAX_ENTRIES:
+        entries.sort(key=lambda entry: entry["used"], reverse=True)
+        del entries[MAX_ENTRIES:]
+
+
+def lookup(hash_value):
+    """Return the cached {"text", "topic", "confidence"} closest to hash_value, or None."""
+    if hash_value is None:
+        return None
+    with _lock:
+        entries = _load()
+        now = time.time()
+        best, best_distance = None, MAX_DISTANCE + 1
+        for entry in entries:
+            if now - entry["created"] >= TTL_SECONDS:
+                continue
+            distance = bin(entry["hash"] ^ hash_value).count("1")
+            if distance < best_distance:
+                best, best_distance = entry, distance
+        if best is None:
+            return None
+        best["used"] = now
+        try:
+            _save()
+        except OSError as e:
+            logger.error(f"Could not write OCR cache: {e}")
+        logger.info(f"OCR cache hit (distance {best_distance}), topic: {best['topic']}")
+        return {"text": best["text"], "topic": best["topic"], "confidence": best["confidence"]}
+
+
+def store(hash_value, text, topic, confidence):
+    """Remember the OCR text and its classified topic for an image hash."""
+    if hash_value is None or not text:
+        return
+    with _lock:
+        entries = _load()
+        now = time.time()
+        entries[:] = [entry for entry in entries if entry["hash"] != hash_value]
+        entries.append({"hash": hash_value, "bits": HASH_BITS, "text": text, "topic": topic,
+                        "confidence": confidence, "created": now, "used": now})
+        _expire(entries, now)
+        try:
+            _save()
+        except OSError as e:
+            logger.error(f"Could not write OCR cache: {e}")
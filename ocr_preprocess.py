@@ -0,0 +1,128 @@
+import time
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cloud OCR reads text reliably at roughly this many pixels per line
+TARGET_TEXT_HEIGHT = 24
+MAX_DIMENSION = 1600
+JPEG_QUALITY = 80
+
+# A page outline must cover at least this much of the frame to be cropped to
+MIN_PAGE_AREA = 0.2
+# Skew smaller than this (degrees) is left alone; larger than MAX_SKEW is
+# more likely a cluttered background than a tilted page
+MIN_SKEW = 0.5
+MAX_SKEW = 15
+
+
+def _order_corners(points):
+    """Order four points as top-left, top-right, bottom-right, bottom-left."""
+    points = points.reshape(4, 2).astype(np.float32)
+    sums = points.sum(axis=1)
+    diffs = np.diff(points, axis=1).ravel()
+    return np.array([points[np.argmin(sums)], points[np.argmin(diffs)],
+                     points[np.argmax(sums)], points[np.argmax(diffs)]], dtype=np.float32)
+
+
+def find_page(gray):
+    """Return the four corners of the worksheet in gray, or None."""
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.Canny(blurred, 50, 150)
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    frame_area = gray.shape[0] * gray.shape[1]
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        if cv2.contourArea(contour) < MIN_PAGE_AREA * frame_area:
+            break
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4:
+            return _order_corners(approx)
+    return None
+
+
+def crop_page(gray, corners):
+    """Warp the page inside corners to a flat, upright rectangle."""
+    top_left, top_right, bottom_right, bottom_left = corners
+    width = int(max(np.linalg.norm(top_right - top_left), np.linalg.norm(bottom_right - bottom_left)))
+    height = int(max(np.linalg.norm(bottom_left - top_left), np.linalg.norm(bottom_right - top_right)))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(corners, target)
+    return cv2.warpPerspective(gray, matrix, (width, height))
+
+
+def deskew(gray):
+    """Rotate gray so its lines of text run horizontally."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    coords = cv2.findNonZero(binary)
+    if coords is None:
+        return gray
+    angle = cv2.minAreaRect(coords)[-1]
+    # minAreaRect reports angles in [0, 90); fold into [-45, 45)
+    if angle >= 45:
+        angle -= 90
+    if abs(angle) < MIN_SKEW or abs(angle) > MAX_SKEW:
+        return gray
+    h, w = gray.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+
+def text_height(gray):
+    """Estimate the median character height in pixels, or None."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary)
+    heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+    # Ignore specks and ruled lines / borders
+    heights = heights[(heights > 4) & (heights < gray.shape[0] // 4)]
+    if len(heights) < 5:
+        return None
+    return float(np.median(heights))
+
+
+def downscale(gray):
+    """Shrink gray until text is about TARGET_TEXT_HEIGHT pixels tall."""
+    h, w = gray.shape
+    scale = min(1.0, MAX_DIMENSION / max(h, w))
+    measured = text_height(gray)
+    if measured and measured > TARGET_TEXT_HEIGHT:
+        scale = min(scale, TARGET_TEXT_HEIGHT / measured)
+    if scale >= 1:
+        return gray
+    return cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+def prepare(content):
+    """Turn an encoded camera photo into a smaller JPEG for OCR.
+
+    Converts to grayscale, crops and flattens the worksheet when its outline
+    is visible (deskewing otherwise), shrinks to the target text height and
+    re-encodes. Returns the original bytes if anything goes wrong.
+    """
+    start = time.monotonic()
+    try:
+        gray = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            logger.warning("Could not decode image for pre-processing")
+            return content
+
+        corners = find_page(gray)
+        if corners is not None:
+            gray = crop_page(gray, corners)
+        else:
+            gray = deskew(gray)
+        gray = downscale(gray)
+
+        ok, encoded = cv2.imencode(".jpg", gray, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        if not ok or len(encoded) >= len(content):
+            return content
+        logger.info(f"OCR image {len(content) // 1024} KB -> {len(encoded) // 1024} KB "
+                    f"({gray.shape[1]}x{gray.shape[0]}, page {'found' if corners is not None else 'not found'}) "
+                    f"in {(time.monotonic() - start) * 1000:.0f} ms")
+        return encoded.tobytes()
+    except Exception as e:
+        logger.error(f"OCR pre-processing error: {e}")
+        return content
@@ -0,0 +1,91 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import pygame
+
+import audio_cache
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for decoded audio kept in memory (bytes of PCM)
+MAX_BANK_BYTES = 64 * 1024 * 1024
+
+# Decoded sounds keyed by file path, least recently used first
+_sounds = OrderedDict()
+_sound_sizes = {}
+_bank_bytes = 0
+_lock = threading.Lock()
+
+
+def _sound_nbytes(sound):
+    """Estimate the PCM size of a decoded pygame Sound."""
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        return 0
+    frequency, size, channels = mixer_format
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def _evict(needed_bytes):
+    """Drop least recently used sounds until needed_bytes fit in the bank."""
+    global _bank_bytes
+    while _sounds and _bank_bytes + needed_bytes > MAX_BANK_BYTES:
+        path, _ = _sounds.popitem(last=False)
+        _bank_bytes -= _sound_sizes.pop(path, 0)
+        logger.info(f"Evicted from sound bank: {path}")
+
+
+def _load(file_path):
+    """Decode a file into the bank. Caller must hold the lock."""
+    global _bank_bytes
+    sound = audio_cache.load(file_path)
+    nbytes = _sound_nbytes(sound)
+    if nbytes > MAX_BANK_BYTES:
+        logger.warning(f"Sound too large for bank, not cached: {file_path}")
+        return sound
+    _evict(nbytes)
+    _sounds[file_path] = sound
+    _sound_sizes[file_path] = nbytes
+    _bank_bytes += nbytes
+    return sound
+
+
+def get_sound(file_path):
+    """Return the decoded Sound for file_path, loading it on a miss.
+
+    Returns None if the file does not exist.
+    """
+    with _lock:
+        sound = _sounds.get(file_path)
+        if sound is not None:
+            _sounds.move_to_end(file_path)
+            return sound
+        if not file_path or not os.path.exists(file_path):
+            return None
+        return _load(file_path)
+
+
+def preload(file_paths):
+    """Decode every existing file in file_paths into the bank."""
+    loaded = 0
+    for file_path in dict.fromkeys(file_paths):
+        try:
+            if get_sound(file_path) is not None:
+                loaded += 1
+            else:
+                logger.warning(f"Audio file not found: {file_path}")
+        except Exception as e:
+            logger.error(f"Error preloading audio {file_path}: {e}")
+    logger.info(f"Sound bank ready: {loaded} sounds, {_bank_bytes // 1024} KB")
+    return loaded
+
+
+def clear():
+    """Forget every decoded sound."""
+    global _bank_bytes
+    with _lock:
+        _sounds.clear()
+        _sound_sizes.clear()
+        _bank_bytes = 0
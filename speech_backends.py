@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import logging
+import threading
+
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:  # local recognition is optional
+    vosk = None
+
+logger = logging.getLogger(__name__)
+
+# Small English model from https://alphacephei.com/vosk/models, unpacked here
+VOSK_MODEL_PATH = "models/vosk-model-small-en-us"
+LANGUAGE = "en-US"
+
+# Microphone chunk fed to the streaming recognizer: 0.1 s at 16 kHz
+STREAM_RATE = 16000
+STREAM_CHUNK = 1600
+
+# Grammar results with a lower mean word confidence are treated as not
+# understood, so the phrase escalates to open dictation
+GRAMMAR_MIN_CONFIDENCE = 0.6
+
+# A partial hypothesis is reported once it has not changed for this many
+# chunks, so half-heard words are not acted on
+STABLE_CHUNKS = 3
+
+_model = None
+_model_lock = threading.Lock()
+_grammar = None
+
+# Finished phrases handed to each backend, for calls_per_hour()
+call_counts = {}
+_counting_since = time.monotonic()
+
+
+def local_available():
+    """True if the vosk package and its model are installed."""
+    return vosk is not None and os.path.isdir(VOSK_MODEL_PATH)
+
+
+def get_model():
+    """Load the vosk model once and share it; None if it is not installed."""
+    global _model
+    with _model_lock:
+        if _model is None and local_available():
+            vosk.SetLogLevel(-1)
+            _model = vosk.Model(VOSK_MODEL_PATH)
+            logger.info(f"Vosk model loaded from {VOSK_MODEL_PATH}")
+        return _model
+
+
+def set_grammar(phrases):
+    """Restrict grammar recognition to the given command phrases.
+
+    Anything else decodes as "[unk]", which makes the grammar result fail
+    and the phrase escalate.
+    """
+    global _grammar
+    words = sorted({phrase.lower().strip() for phrase in phrases if phrase.strip()})
+    _grammar = json.dumps(words + ["[unk]"])
+    logger.info(f"Speech grammar set with {len(words)} phrases")
+
+
+def grammar_result(result):
+    """Text of a vosk result with words enabled, or "" if the grammar fit is poor."""
+    words = result.get("result", [])
+    if not words or any(word["word"] == "[unk]" for word in words):
+        return ""
+    confidence = sum(word["conf"] for word in words) / len(words)
+    if confidence < GRAMMAR_MIN_CONFIDENCE:
+        logger.info(f"Grammar result '{result.get('text', '')}' too uncertain ({confidence:.2f})")
+        return ""
+    return result.get("text", "")
+
+
+def _kaldi_recognizer(model, sample_rate, grammar=None):
+    if grammar is None:
+        return vosk.KaldiRecognizer(model, sample_rate)
+    session = vosk.KaldiRecognizer(model, sample_rate, grammar)
+    session.SetWords(True)
+    return session
+
+
+def google_recognize(recognizer, audio):
+    """Cloud recognition of a finished phrase."""
+    try:
+        return recognizer.recognize_google(audio, language=LANGUAGE).lower()
+    except sr.UnknownValueError:
+        return None
+
+
+def local_recognize(recognizer, audio):
+    """On-device recognition of a finished phrase with vosk."""
+    model = get_model()
+    if model is None:
+        return None
+    session = _kaldi_recognizer(model, STREAM_RATE)
+    session.AcceptWaveform(audio.get_raw_data(convert_rate=STREAM_RATE, convert_width=2))
+    text = json.loads(session.FinalResult()).get("text", "")
+    return text or None
+
+
+def grammar_recognize(recognizer, audio):
+    """On-device recognition against the command grammar only."""
+    model = get_model()
+    if model is None or _grammar is None:
+        return None
+    session = _kaldi_recognizer(model, STREAM_RATE, _grammar)
+    session.AcceptWaveform(audio.get_raw_data(convert_rate=STREAM_RATE, convert_width=2))
+    return grammar_result(json.loads(session.FinalResult())) or None
+
+
+# Every backend takes (recognizer, sr.AudioData) and returns text or None
+BACKENDS = {
+    "google": google_recognize,
+    "local": local_recognize,
+    "grammar": grammar_recognize,
+}
+
+
+def recognize(recognizer, audio, backends=("google",)):
+    """Turn a finished phrase into lowercase text.
+
+    The backends are tried in order until one understands the phrase, so
+    cheap constrained recognition can come first and escalate to open
+    dictation. Returns None when nothing was understood; network errors
+    from the cloud backend are raised.
+    """
+    for backend in backends:
+        call_counts[backend] = call_counts.get(backend, 0) + 1
+        text = BACKENDS[backend](recognizer, audio)
+        if text:
+            logger.info(f"Recognized by {backend}: {text}")
+            return text
+        logger.debug(f"{backend} recognition empty")
+    return None
+
+
+def calls_per_hour():
+    """Recognition calls per backend per hour since startup."""
+    hours = max((time.monotonic() - _counting_since) / 3600, 1e-6)
+    return {backend: round(count / hours, 1) for backend, count in call_counts.items()}
+
+
+class StreamingSession:
+    """Feeds microphone chunks to vosk and reports hypotheses as they form.
+
+    on_partial(text) is called whenever a new partial hypothesis has been
+    stable for STABLE_CHUNKS chunks, while the child is still talking.
+    on_final(text, audio) is called at the end of each utterance with the
+    final text (possibly empty) and the utterance as sr.AudioData, so it
+    can be sent to another backend.
+
+    With grammar set, decoding is limited to the command phrases and a
+    final result that fits them poorly is reported as empty text.
+    """
+
+    def __init__(self, model, sample_rate, sample_width, on_partial, on_final, grammar=None):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.grammar = grammar
+        self._recognizer = _kaldi_recognizer(model, sample_rate, grammar)
+        self._frames = []
+        self._heard = False  # speech in the buffered frames
+        self._partial = ""
+        self._stable = 0
+        self._reported = ""
+
+    def feed(self, chunk, speech=False):
+        """Decode one chunk; speech says a voice activity detector hears someone."""
+        self._frames.append(chunk)
+        if self._recognizer.AcceptWaveform(chunk):
+            result = json.loads(self._recognizer.Result())
+            self._finish(grammar_result(result) if self.grammar else result.get("text", ""))
+            return
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        # "[unk]" is speech outside the grammar: keep its audio for
+        # escalation, but never report it as a command
+        self._heard = self._heard or speech or bool(partial)
+        if "[unk]" in partial:
+            partial = ""
+        if not partial:
+            if not self._heard:
+                # Keep only a little leading silence with the utterance
+                del self._frames[:-STABLE_CHUNKS]
+            return
+        if partial == self._partial:
+            self._stable += 1
+        else:
+            self._partial, self._stable = partial, 0
+        if self._stable >= STABLE_CHUNKS and partial != self._reported:
+            self._reported = partial
+            self.on_partial(partial)
+
+    def end_utterance(self, data=None):
+        """Finish the current utterance now, e.g. when VAD hears it end.
+
+        data is the utterance as the VAD trimmed it; it replaces the
+        buffered frames in the audio handed to on_final.
+        """
+        if not self._heard:
+            return
+        result = json.loads(self._recognizer.FinalResult())
+        self._finish(grammar_result(result) if self.grammar else result.get("text", ""), data)
+
+    def reset(self):
+        """Drop a half-heard utterance."""
+        self._recognizer.Reset()
+        self._frames = []
+        self._heard = False
+        self._partial, self._stable, self._reported = "", 0, ""
+
+    def _finish(self, text, data=None):
+        call_counts["stream"] = call_counts.get("stream", 0) + 1
+        if data is None:
+            data = b"".join(self._frames)
+        audio = sr.AudioData(data, self.sample_rate, self.sample_width)
+        self._frames = []
+        self._heard = False
+        self._partial, self._stable, self._reported = "", 0, ""
+        self.on_final(text, audio)
+
+
+def listen_streaming(microphone, on_partial, on_final, use_grammar=True, gate=None, endpointer=None):
+    """Stream the microphone through vosk on a background thread.
+
+    The counterpart of Recognizer.listen_in_background for the local
+    engine; with use_grammar and a grammar set, it decodes commands only.
+    With a gate (see wake_word.WakeWordGate) chunks only reach command
+    recognition while the gate is open. With an endpointer (see
+    vad.Endpointer) utterances end as soon as it hears the child stop,
+    rather than after vosk's fixed trailing silence. Returns a stopper
+    function taking wait_for_stop, or None if vosk is not available.
+    """
+    model = get_model()
+    if model is None:
+        return None
+    running = threading.Event()
+    running.set()
+
+    def run():
+        with microphone as source:
+            session = StreamingSession(model, source.SAMPLE_RATE, source.SAMPLE_WIDTH,
+                                       on_partial, on_final,
+                                       _grammar if use_grammar else None)
+            was_open = False
+            while running.is_set():
+                try:
+                    chunk = source.stream.read(source.CHUNK)
+                except Exception as e:
+                    logger.error(f"Microphone read error: {e}")
+                    break
+                try:
+                    if gate is None or gate.feed(chunk):
+                        was_open = True
+                        if endpointer is None:
+                            session.feed(chunk)
+                        else:
+                            utterance = endpointer.feed(chunk)
+                            session.feed(chunk, speech=endpointer.in_speech or bool(utterance))
+                            if utterance:
+                                # Escalation gets the trimmed, pre/post-rolled audio
+                                session.end_utterance(utterance)
+                    else:
+                        if was_open:
+                            was_open = False
+                            session.reset()
+                        if endpointer is not None:
+                            # Keep learning the room noise while asleep
+                            endpointer.observe(chunk)
+                except Exception as e:
+                    logger.error(f"Streaming recognition error: {e}")
+
+    thread = threading.Thread(target=run, name="speech-stream", daemon=True)
+    thread.start()
+
+    def stopper(wait_for_stop=True):
+        running.clear()
+        if wait_for_stop:
+            thread.join()
+
+    return stopper
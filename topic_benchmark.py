@@ -0,0 +1,61 @@
+"""Score the topic classifier against a corpus of OCR strings.
+
+Usage: python topic_benchmark.py [corpus.json]
+
+Each corpus entry has the OCR "text" and the expected "topic" (null when
+no game should be picked). Prints every miss and the accuracy of the
+scoring classifier next to the old first-keyword-match behaviour.
+"""
+import sys
+import json
+import time
+import logging
+
+import topic_scoring
+from topic_config import TOPIC_CONFIG, TOPIC_MATCHER
+
+
+def first_match(text):
+    """The original classifier: first TOPIC_CONFIG keyword found anywhere wins."""
+    matched = {match.keyword for match in TOPIC_MATCHER.find_all(text)}
+    for topic, config in TOPIC_CONFIG.items():
+        if any(keyword in matched for keyword in config["keywords"]):
+            return topic
+    return None
+
+
+def scored(text):
+    ranked = topic_scoring.rank_topics(text, TOPIC_CONFIG, TOPIC_MATCHER)
+    if ranked and ranked[0][1] >= topic_scoring.MIN_CONFIDENCE:
+        return ranked[0]
+    return None, 0.0
+
+
+def main(corpus_path):
+    with open(corpus_path, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    legacy_hits = scored_hits = follow_ups = 0
+    start = time.monotonic()
+    for case in corpus:
+        text, expected = case["text"].lower(), case["topic"]
+        legacy = first_match(text)
+        topic, confidence = scored(text)
+        legacy_hits += legacy == expected
+        scored_hits += topic == expected
+        if topic and confidence < topic_scoring.CONFIRM_CONFIDENCE:
+            follow_ups += 1
+        if topic != expected:
+            print(f"MISS expected={expected} got={topic} ({confidence:.2f}): {text[:50]!r}")
+    elapsed = time.monotonic() - start
+
+    total = len(corpus)
+    print(f"\n{total} cases, {elapsed * 1000 / total:.2f} ms per case")
+    print(f"First keyword match: {legacy_hits}/{total} correct ({100 * legacy_hits / total:.0f}%)")
+    print(f"Weighted scoring:    {scored_hits}/{total} correct ({100 * scored_hits / total:.0f}%), "
+          f"{follow_ups} would ask a follow-up question")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main(sys.argv[1] if len(sys.argv) > 1 else "topic_corpus.json")
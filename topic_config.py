@@ -0,0 +1,80 @@
+"""Topics the assistant knows: their game, intro audio and keywords.
+
+Kept apart from main.py, which sets up GPIO, audio and the microphone on
+import, so tools such as topic_benchmark.py can load the topics anywhere.
+"""
+import topic_matcher
+
+# Topic-specific audio files and file mappings
+TOPIC_CONFIG = {
+    "addition": {
+        "file": "web-games/addition.html",
+        "audio": "audio_files/addition.wav",
+        "keywords": ["addition", "add", "plus", "+", "sum", "adding", "added"]
+    },
+    "subtraction": {
+        "file": "web-games/subtraction.html", 
+        "audio": "audio_files/subtraction.wav",
+        "keywords": ["subtraction", "subtract", "minus", "-", "difference", "subtracting", "subtracted"]
+    },
+    "multiplication": {
+        "file": "web-games/multiplication.html",
+        "audio": "audio_files/multiplication.wav", 
+        "keywords": ["multiplication", "multiply", "times", "Ã—", "*", "product", "multiplying", "multiplied"]
+    },
+    "division": {
+        "file": "web-games/division.html",
+        "audio": "audio_files/division.wav",
+        "keywords": ["division", "divide", "Ã·", "/", "quotient", "dividing", "divided"]
+    },
+    "colours": {
+        "file": "py_games/colors.py",
+        "game": "color_quiz",
+        "audio": "audio_files/Colors.wav",
+        "keywords": ["color", "colour", "colors", "colours", "red", "blue", "green", "yellow"]
+    },
+    "shapes": {
+        "file": "web-games/shapes.html",
+        "audio": "audio_files/shapes.wav",
+        "keywords": ["shape", "shapes", "circle", "square", "triangle", "rectangle", "geometry"]
+    },
+    "face": {
+        "file": "face_parts_quiz.py", 
+        "game": "face_parts_practice",
+        "audio": "audio_files/face_detection.wav",
+        "keywords": ["face", "facial", "features", "eyes", "nose", "mouth", "ears", "cheeks", "chin", "forehead", "skin", "face anatomy", "face detection", "facial recognition", "biology", "body", "human anatomy"]
+    },
+    "parts": {
+        "file": "py_games/face_parts_quiz.py", 
+        "game": "face_parts_quiz",
+        "audio": "audio_files/face_detection.wav",
+        "keywords": ["face", "facial", "features", "eyes", "nose", "mouth", "ears", "cheeks", "chin", "forehead", "skin", "face anatomy", "face detection", "facial recognition", "biology", "body", "human anatomy"]
+    },
+    "finger": {
+        "file": "py_games/finger_count.py", 
+        "game": "finger_counting_quiz",
+        "audio": "audio_files/finger_detection.wav",
+        "keywords": ["finger", "fingers", "hand", "count", "digits", "thumb", "index", "middle", "ring", "little", "hand anatomy", "digit count", "biomechanics", "body", "biology"]
+    },
+    "counting": {
+        "file": "py_games/finger_count.py", 
+        "game": "finger_counting_quiz",
+        "audio": "audio_files/finger_detection.wav",
+        "keywords": ["finger", "fingers", "hand", "count", "digits", "thumb", "index", "middle", "ring", "little", "hand anatomy", "digit count", "biomechanics", "body", "biology"]
+    },
+    "color": {
+        "file": "py_games/colors.py", 
+        "game": "color_quiz",
+        "audio": "audio_files/Colors.wav",
+        "keywords": ["color", "colors", "hue", "spectrum", "red", "blue", "green", "yellow", "pigment", "palette", "tone", "shade", "saturation", "light", "dark"]
+    },
+    "colors": {
+        "file": "py_games/colors.py", 
+        "game": "color_quiz",
+        "audio": "audio_files/Colors.wav",
+        "keywords": ["color", "colors", "hue", "palette", "spectrum", "paint", "shades", "mix", "vibrancy", "primary", "secondary", "tonal", "vibrancy"]
+    }
+}
+
+# All topic keywords compiled into one matcher so OCR text is scanned once
+TOPIC_MATCHER = topic_matcher.build_topic_matcher(TOPIC_CONFIG)
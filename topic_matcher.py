@@ -0,0 +1,73 @@
+from collections import deque, namedtuple
+
+# One keyword occurrence: text[start:end] == keyword, found for every topic
+# in topics that lists that keyword
+Match = namedtuple("Match", ["start", "end", "keyword", "topics"])
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of keywords.
+
+    Built once, it finds every occurrence of every keyword (overlaps
+    included) in a single left-to-right pass over the text, so the cost is
+    linear in the text length plus the number of matches.
+    """
+
+    def __init__(self, keyword_topics):
+        # keyword_topics maps each keyword to the topics that use it
+        self.topics = {keyword: tuple(topics) for keyword, topics in keyword_topics.items()}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword in self.topics:
+            if not keyword:
+                continue
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = next_node
+            self._out[node] += (keyword,)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find_all(self, text):
+        """Return every keyword occurrence in text as a list of Match, in end order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in out[node]:
+                matches.append(Match(index + 1 - len(keyword), index + 1, keyword, self.topics[keyword]))
+        return matches
+
+
+def build_topic_matcher(topic_config):
+    """Compile the keywords of a TOPIC_CONFIG-style dict into a KeywordMatcher."""
+    keyword_topics = {}
+    for topic, config in topic_config.items():
+        for keyword in config["keywords"]:
+            topics = keyword_topics.setdefault(keyword.lower(), [])
+            if topic not in topics:
+                topics.append(topic)
+    return KeywordMatcher(keyword_topics)
@@ -0,0 +1,133 @@
+import math
+import logging
+
+import math_parser
+
+logger = logging.getLogger(__name__)
+
+# Evidence weights
+WORD_WEIGHT = 1.0          # keyword found as a whole word
+PHRASE_WEIGHT = 1.5        # multi-word keyword such as "face anatomy"
+PARTIAL_WEIGHT = 0.25      # keyword buried inside a longer word
+SYMBOL_WEIGHT = 0.3        # an operator symbol inside a problem on its line
+EXPRESSION_WEIGHT = 2.0    # a worked arithmetic expression like "3 + 4"
+HEADING_BOOST = 2.0        # multiplier for evidence on the first line
+LAYOUT_WEIGHT = 3.0        # most lines are problems of the same kind
+LAYOUT_MIN_SHARE = 0.5
+MAX_REPEATS = 3            # occurrences of one keyword that count
+
+# How much evidence it takes before a topic is trusted on its own
+EVIDENCE_SCALE = 2.0
+
+# Below MIN_CONFIDENCE nothing was found; below CONFIRM_CONFIDENCE the
+# child should be asked before a game is launched
+MIN_CONFIDENCE = 0.3
+CONFIRM_CONFIDENCE = 0.5
+
+
+def _alias_groups(topic_config):
+    """Group topics that are really the same game.
+
+    Topics are aliases when they launch the same file or share an identical
+    keyword list. Returns {topic: canonical topic}, where the canonical
+    topic is the first alias in TOPIC_CONFIG order.
+    """
+    canonical = {}
+    by_file = {}
+    by_keywords = {}
+    for topic, config in topic_config.items():
+        keywords = frozenset(config["keywords"])
+        alias = by_file.get(config["file"]) or by_keywords.get(keywords)
+        canonical[topic] = canonical[alias] if alias else topic
+        by_file.setdefault(config["file"], topic)
+        by_keywords.setdefault(keywords, topic)
+    return canonical
+
+
+def _is_whole_word(text, start, end):
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not before.isalnum() and not after.isalnum()
+
+
+def _keyword_weight(text, match):
+    keyword = match.keyword
+    if not any(char.isalnum() for char in keyword):
+        return SYMBOL_WEIGHT
+    if not _is_whole_word(text, match.start, match.end):
+        return PARTIAL_WEIGHT
+    return PHRASE_WEIGHT if " " in keyword else WORD_WEIGHT
+
+
+def score_topics(text, topic_config, matcher):
+    """Return {canonical topic: evidence score} for OCR text."""
+    canonical = _alias_groups(topic_config)
+    scores = {}
+    stripped = text.lstrip()
+    heading_end = len(text) - len(stripped) + len(stripped.split("\n", 1)[0])
+    repeats = {}
+
+    def add(topics, weight):
+        groups = {canonical[topic] for topic in topics if topic in canonical}
+        for group in groups:
+            # A keyword shared by several games says less about each one
+            scores[group] = scores.get(group, 0.0) + weight / len(groups)
+
+    lines = text.split("\n")
+    line_problems = [math_parser.extract_problems(line) for line in lines]
+
+    for match in matcher.find_all(text):
+        if not any(char.isalnum() for char in match.keyword):
+            # A bare symbol only counts as part of a problem: the dashes in
+            # "2024-10-17" or "name: ____" say nothing about subtraction
+            line = text.count("\n", 0, match.start)
+            operator = math_parser.normalize(match.keyword)
+            if not any(problem.operator == operator for problem in line_problems[line]):
+                continue
+        repeats[match.keyword] = repeats.get(match.keyword, 0) + 1
+        if repeats[match.keyword] > MAX_REPEATS:
+            continue
+        weight = _keyword_weight(text, match)
+        if match.end <= heading_end:
+            weight *= HEADING_BOOST
+        add(match.topics, weight)
+
+    line_topics = []
+    for line, problems in zip(lines, line_problems):
+        if not line.strip():
+            continue
+        topics_on_line = set()
+        for problem in problems:
+            topic = math_parser.OPERATOR_TOPICS[problem.operator]
+            if topic in canonical:
+                add([topic], EXPRESSION_WEIGHT)
+                topics_on_line.add(topic)
+        line_topics.append(topics_on_line)
+
+    # Worksheets are laid out as one problem per line
+    if line_topics:
+        for topic in set().union(*line_topics):
+            share = sum(topic in topics for topics in line_topics) / len(line_topics)
+            if share >= LAYOUT_MIN_SHARE:
+                add([topic], LAYOUT_WEIGHT * share)
+
+    return scores
+
+
+def rank_topics(text, topic_config, matcher):
+    """Rank topics for OCR text.
+
+    Returns a list of (topic, confidence) pairs, best first. Confidence is
+    the topic's share of all evidence, discounted when there is little
+    evidence overall, so it lies between 0 and 1.
+    """
+    if not text:
+        return []
+    scores = score_topics(text, topic_config, matcher)
+    total = sum(scores.values())
+    if total <= 0:
+        return []
+    order = list(topic_config)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], order.index(item[0])))
+    return [(topic, (score / total) * (1 - math.exp(-score / EVIDENCE_SCALE)))
+            for topic, score in ranked]
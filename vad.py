@@ -0,0 +1,182 @@
+import logging
+import threading
+
+import numpy as np
+import speech_recognition as sr
+
+logger = logging.getLogger(__name__)
+
+# Analysis frame length in seconds
+FRAME_SECONDS = 0.02
+
+# A frame is speech when it is this many dB above the noise floor and
+# its spectrum is not flat like fan hum or hiss
+SPEECH_MARGIN_DB = 9.0
+LOUD_MARGIN_DB = 20.0        # loud enough to count regardless of spectrum
+MAX_FLATNESS = 0.45
+SPEECH_BAND = (250, 4000)    # Hz, where most speech energy lies
+MIN_BAND_SHARE = 0.5
+
+# Noise floor tracking: slow adaptation on non-speech frames
+NOISE_ADAPT = 0.05
+DEFAULT_NOISE_RMS = 100.0
+
+# Endpointing. The pause that ends a phrase grows with how long the child
+# has been talking: "hi" ends after MIN_PAUSE, a sentence with thinking
+# gaps gets up to MAX_PAUSE.
+MIN_PAUSE = 0.3
+MAX_PAUSE = 0.9
+PAUSE_PER_SECOND = 0.2
+MIN_SPEECH = 0.15            # shorter bursts are clicks and bumps
+MAX_PHRASE = 12.0            # safety cap, well above any command
+PRE_ROLL = 0.15              # audio kept before the first speech frame
+POST_ROLL = 0.1              # and after the last one
+
+
+def frame_features(samples, sample_rate):
+    """Return (rms, spectral flatness, speech band share) for one frame."""
+    samples = samples.astype(np.float32)
+    rms = float(np.sqrt(np.mean(samples * samples))) + 1e-9
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples)))) + 1e-9
+    power = spectrum * spectrum
+    flatness = float(np.exp(np.mean(np.log(power))) / np.mean(power))
+    freqs = np.fft.rfftfreq(len(samples), 1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND[0]) & (freqs <= SPEECH_BAND[1])
+    band_share = float(power[band].sum() / power.sum())
+    return rms, flatness, band_share
+
+
+def measure_noise(source, seconds=0.5):
+    """Return the RMS level of seconds of audio read from an open microphone source."""
+    chunks = max(1, int(seconds * source.SAMPLE_RATE / source.CHUNK))
+    data = b"".join(source.stream.read(source.CHUNK) for _ in range(chunks))
+    samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+
+
+class Endpointer:
+    """Splits a raw 16-bit mono audio stream into trimmed utterances.
+
+    feed() takes chunks of any size and returns the bytes of an utterance
+    once its end has been detected (or None), with leading and trailing
+    silence trimmed to PRE_ROLL and POST_ROLL.
+    """
+
+    def __init__(self, sample_rate, sample_width=2, noise_rms=None):
+        if sample_width != 2:
+            raise ValueError("Endpointer expects 16-bit audio")
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_bytes = int(sample_rate * FRAME_SECONDS) * sample_width
+        self.noise_rms = noise_rms or DEFAULT_NOISE_RMS
+        self._buffer = b""
+        self._pre_roll = []
+        self._utterance = []
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def in_speech(self):
+        return bool(self._utterance)
+
+    def is_speech(self, frame):
+        """Classify one frame, updating the noise floor when it is not speech."""
+        samples = np.frombuffer(frame, dtype=np.int16)
+        rms, flatness, band_share = frame_features(samples, self.sample_rate)
+        margin = 20 * np.log10(rms / self.noise_rms)
+        speech = margin >= LOUD_MARGIN_DB or (
+            margin >= SPEECH_MARGIN_DB and flatness <= MAX_FLATNESS and band_share >= MIN_BAND_SHARE)
+        if not speech:
+            self.noise_rms += NOISE_ADAPT * (rms - self.noise_rms)
+            self.noise_rms = max(self.noise_rms, 1.0)
+        return speech
+
+    def _pause_needed(self):
+        spoken = self._speech_frames * FRAME_SECONDS
+        return min(MAX_PAUSE, MIN_PAUSE + PAUSE_PER_SECOND * spoken)
+
+    def _end(self):
+        trailing = max(0, self._silent_frames - int(POST_ROLL / FRAME_SECONDS))
+        frames = self._utterance[:len(self._utterance) - trailing]
+        speech = self._speech_frames * FRAME_SECONDS
+        self._utterance = []
+        self._speech_frames = self._silent_frames = 0
+        if speech < MIN_SPEECH:
+            return None
+        data = b"".join(frames)
+        self.bytes_out += len(data)
+        return data
+
+    def observe(self, chunk):
+        """Track the noise floor from audio that is not being endpointed."""
+        self._buffer = b""
+        self._utterance, self._pre_roll = [], []
+        self._speech_frames = self._silent_frames = 0
+        for start in range(0, len(chunk) - self.frame_bytes + 1, self.frame_bytes):
+            self.is_speech(chunk[start:start + self.frame_bytes])
+
+    def feed(self, chunk):
+        self.bytes_in += len(chunk)
+        self._buffer += chunk
+        result = None
+        while len(self._buffer) >= self.frame_bytes:
+            frame, self._buffer = self._buffer[:self.frame_bytes], self._buffer[self.frame_bytes:]
+            speech = self.is_speech(frame)
+            if not self._utterance:
+                if speech:
+                    self._utterance = self._pre_roll + [frame]
+                    self._pre_roll = []
+                    self._speech_frames = 1
+                else:
+                    self._pre_roll = (self._pre_roll + [frame])[-int(PRE_ROLL / FRAME_SECONDS):]
+                continue
+            self._utterance.append(frame)
+            if speech:
+                self._speech_frames += 1
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+            too_long = len(self._utterance) * FRAME_SECONDS >= MAX_PHRASE
+            if too_long or self._silent_frames * FRAME_SECONDS >= self._pause_needed():
+                result = self._end() or result
+        return result
+
+    def stats(self):
+        sent = self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+        return {"noise_rms": round(self.noise_rms, 1), "share_sent": round(sent, 3)}
+
+
+def listen_in_background(microphone, recognizer, callback, noise_rms=None):
+    """Drop-in for Recognizer.listen_in_background using the Endpointer.
+
+    Calls callback(recognizer, audio) with each trimmed utterance as
+    sr.AudioData. Returns (stopper, endpointer); the stopper takes
+    wait_for_stop like the speech_recognition one.
+    """
+    running = threading.Event()
+    running.set()
+    endpointer = Endpointer(microphone.SAMPLE_RATE, microphone.SAMPLE_WIDTH, noise_rms)
+
+    def run():
+        with microphone as source:
+            while running.is_set():
+                try:
+                    chunk = source.stream.read(source.CHUNK)
+                except Exception as e:
+                    logger.error(f"Microphone read error: {e}")
+                    break
+                data = endpointer.feed(chunk)
+                if data:
+                    callback(recognizer, sr.AudioData(data, source.SAMPLE_RATE, source.SAMPLE_WIDTH))
+
+    thread = threading.Thread(target=run, name="vad-listener", daemon=True)
+    thread.start()
+
+    def stopper(wait_for_stop=True):
+        running.clear()
+        if wait_for_stop:
+            thread.join()
+
+    return stopper, endpointer
@@ -0,0 +1,116 @@
+import time
+import logging
+import threading
+
+import grpc
+from google.api_core import retry as retries
+from google.cloud import vision
+
+logger = logging.getLogger(__name__)
+
+# How often the keepalive thread makes sure the gRPC channel is connected
+KEEPALIVE_INTERVAL = 45
+CONNECT_TIMEOUT = 10
+
+# A homework scan is interactive: give up after a few seconds instead of
+# the gRPC default deadline, retrying transient errors only within that time
+REQUEST_TIMEOUT = 8
+REQUEST_RETRY = retries.Retry(initial=0.25, maximum=1.0, multiplier=2.0, deadline=REQUEST_TIMEOUT)
+
+_client = None
+_lock = threading.Lock()
+_keepalive_thread = None
+_stop_keepalive = threading.Event()
+
+# Timing breakdown of the most recent detect_text call, in seconds
+last_timings = {}
+
+
+def get_client():
+    """Return the process-wide ImageAnnotatorClient, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = vision.ImageAnnotatorClient()
+            logger.info("Google Vision client created")
+        return _client
+
+
+def _ensure_connected(timeout=CONNECT_TIMEOUT):
+    """Open the gRPC channel (TLS handshake included) if it is idle."""
+    channel = get_client().transport.grpc_channel
+    grpc.channel_ready_future(channel).result(timeout=timeout)
+
+
+def _connect_and_keep_alive(keepalive):
+    start = time.monotonic()
+    try:
+        _ensure_connected()
+        logger.info(f"Google Vision channel ready in {time.monotonic() - start:.2f}s")
+    except Exception as e:
+        # Offline at boot is fine; the first OCR call retries and fails then
+        logger.warning(f"Google Vision not reachable yet: {e}")
+    while keepalive and not _stop_keepalive.wait(KEEPALIVE_INTERVAL):
+        try:
+            _ensure_connected()
+        except Exception as e:
+            logger.warning(f"Vision keepalive failed: {e}")
+
+
+def warm(keepalive=True, wait=False):
+    """Create the client now and connect its channel in the background.
+
+    Raises if the credentials cannot be loaded. The connection (TLS
+    handshake included) is made on a background thread so startup does
+    not wait for the network; with wait it is made here instead, raising
+    if the service is unreachable. With keepalive, the thread keeps
+    reconnecting the channel whenever it goes idle.
+    """
+    global _keepalive_thread
+    get_client()
+    if wait:
+        start = time.monotonic()
+        _ensure_connected()
+        logger.info(f"Google Vision channel ready in {time.monotonic() - start:.2f}s")
+        if not keepalive:
+            return
+    if _keepalive_thread is None or not _keepalive_thread.is_alive():
+        _stop_keepalive.clear()
+        _keepalive_thread = threading.Thread(target=_connect_and_keep_alive, args=(keepalive,),
+                                             name="vision-keepalive", daemon=True)
+        _keepalive_thread.start()
+
+
+def stop_keepalive():
+    _stop_keepalive.set()
+
+
+def detect_text(content):
+    """Run text detection on encoded image bytes.
+
+    Returns (text, timings) where text is the full detected text or None,
+    and timings splits the call into setup, request and parse seconds.
+    """
+    global last_timings
+    timings = {}
+    start = time.monotonic()
+    client = get_client()
+    image = vision.Image(content=content)
+    timings["setup"] = time.monotonic() - start
+
+    start = time.monotonic()
+    response = client.text_detection(image=image, retry=REQUEST_RETRY, timeout=REQUEST_TIMEOUT)
+    timings["request"] = time.monotonic() - start
+
+    start = time.monotonic()
+    text = None
+    if response.error.message:
+        logger.error(f'Google Vision API error: {response.error.message}')
+    elif response.text_annotations:
+        text = response.text_annotations[0].description
+    timings["parse"] = time.monotonic() - start
+
+    last_timings = timings
+    logger.info("Vision timings: " + ", ".join(f"{name} {seconds * 1000:.0f} ms"
+                                               for name, seconds in timings.items()))
+    return text, timings
@@ -0,0 +1,90 @@
+import json
+import time
+import logging
+import threading
+
+import speech_backends
+
+logger = logging.getLogger(__name__)
+
+# What the child says to wake Homi up. The model spells the name in
+# different ways, so all of them count.
+WAKE_PHRASES = ["hey homi", "hey homey", "hey home me", "hi homi", "hi homey", "okay homi"]
+
+# How long Homi keeps listening for commands after the wake word or the
+# last command, in seconds
+LISTEN_WINDOW = 8.0
+
+
+class WakeWordGate:
+    """Keeps command recognition closed until the wake word is heard.
+
+    Every raw microphone chunk goes through feed(). While the gate is
+    closed, chunks only reach a tiny recognizer that knows nothing but the
+    wake phrases; once one is heard the gate opens for LISTEN_WINDOW
+    seconds and feed() returns True so the caller passes chunks on to
+    command recognition. extend() keeps the window open while the child is
+    talking to Homi.
+    """
+
+    def __init__(self, model, sample_rate, on_wake=None, window=LISTEN_WINDOW):
+        self.window = window
+        self.on_wake = on_wake
+        self._recognizer = speech_backends.vosk.KaldiRecognizer(
+            model, sample_rate, json.dumps(WAKE_PHRASES + ["[unk]"]))
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        # Counters for stats(): wake words heard, and utterances that were
+        # kept away from recognition because the gate was closed
+        self.wakes = 0
+        self.suppressed = 0
+
+    def is_open(self):
+        return time.monotonic() < self._open_until
+
+    def open(self, seconds=None):
+        """Open (or extend) the command window without the wake word."""
+        with self._lock:
+            self._open_until = max(self._open_until, time.monotonic() + (seconds or self.window))
+
+    extend = open
+
+    def close(self):
+        with self._lock:
+            self._open_until = 0.0
+
+    def _heard_wake(self, text):
+        return any(phrase in text for phrase in WAKE_PHRASES)
+
+    def feed(self, chunk):
+        """Process one raw chunk; return True if it belongs to a command."""
+        if self.is_open():
+            return True
+        if self._recognizer.AcceptWaveform(chunk):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            if text and not self._heard_wake(text):
+                self.suppressed += 1
+                logger.debug(f"Ignored without wake word: {text}")
+            return False
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        if not self._heard_wake(partial):
+            return False
+        # Act on the partial so the command that follows is not lost
+        self._recognizer.Reset()
+        self.wakes += 1
+        self.open()
+        logger.info("Wake word heard")
+        if self.on_wake:
+            self.on_wake()
+        return False
+
+    def stats(self):
+        """Wake and suppression counts, plus both as rates per hour."""
+        hours = max((time.monotonic() - self.started) / 3600, 1e-6)
+        return {
+            "wakes": self.wakes,
+            "suppressed": self.suppressed,
+            "wakes_per_hour": round(self.wakes / hours, 1),
+            "suppressed_per_hour": round(self.suppressed / hours, 1),
+        }